@@ -0,0 +1,98 @@
+"""Поля ресурсов API и их перевод в запрос.
+
+Для каждого ресурса описаны поля: какие колонки нужны (для only()),
+какую связь присоединить (для select_related) и как получить значение.
+Параметр fields= выбирает подмножество полей, и запрос читает только
+их колонки.
+"""
+from collections import namedtuple
+
+Field = namedtuple('Field', ('columns', 'related', 'value'))
+
+
+class ApiError(Exception):
+    """Ошибка в параметрах запроса: ответ 400."""
+
+
+def location_name(post):
+    location = post.location
+    return location.name if location and location.is_published else None
+
+
+POST_FIELDS = {
+    'id': Field(('id',), None, lambda post: post.pk),
+    'title': Field(('title',), None, lambda post: post.title),
+    'text': Field(('text',), None, lambda post: post.text),
+    'pub_date': Field(('pub_date',), None, lambda post: post.pub_date),
+    'author': Field(
+        ('author__username',), 'author', lambda post: post.author.username
+    ),
+    'category': Field(
+        ('category__slug',), 'category', lambda post: post.category.slug
+    ),
+    'location': Field(
+        ('location__name', 'location__is_published'), 'location',
+        location_name,
+    ),
+    'image': Field(
+        ('image',), None, lambda post: post.image.url if post.image else None
+    ),
+}
+
+CATEGORY_FIELDS = {
+    'id': Field(('id',), None, lambda category: category.pk),
+    'slug': Field(('slug',), None, lambda category: category.slug),
+    'title': Field(('title',), None, lambda category: category.title),
+    'description': Field(
+        ('description',), None, lambda category: category.description
+    ),
+}
+
+LOCATION_FIELDS = {
+    'id': Field(('id',), None, lambda location: location.pk),
+    'name': Field(('name',), None, lambda location: location.name),
+}
+
+COMMENT_FIELDS = {
+    'id': Field(('id',), None, lambda comment: comment.pk),
+    'post': Field(('post_id',), None, lambda comment: comment.post_id),
+    'author': Field(
+        ('author__username',), 'author',
+        lambda comment: comment.author.username,
+    ),
+    'text': Field(('text',), None, lambda comment: comment.text),
+    'created_at': Field(
+        ('created_at',), None, lambda comment: comment.created_at
+    ),
+}
+
+
+def select_fields(spec, requested):
+    """Поля из параметра fields=; без него - все поля ресурса."""
+    if not requested:
+        return list(spec)
+    names = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = [name for name in names if name not in spec]
+    if unknown:
+        raise ApiError(
+            f'Неизвестные поля: {", ".join(unknown)}. '
+            f'Доступны: {", ".join(spec)}.'
+        )
+    return names
+
+
+def apply_fields(queryset, spec, names, extra_columns=()):
+    """Ограничивает queryset колонками выбранных полей."""
+    columns = set(extra_columns)
+    related = set()
+    for name in names:
+        columns.update(spec[name].columns)
+        if spec[name].related:
+            # Внешний ключ нельзя отложить и присоединить одновременно.
+            columns.add(spec[name].related)
+            related.add(spec[name].related)
+    return queryset.select_related(*related).only(*columns)
+
+
+def serialize(obj, spec, names):
+    return {name: spec[name].value(obj) for name in names}
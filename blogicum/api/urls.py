@@ -0,0 +1,16 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('v1/posts/', views.post_list, name='post_list'),
+    path('v1/posts/<int:pk>/', views.post_detail, name='post_detail'),
+    path('v1/posts/<int:pk>/comments/',
+         views.post_comments, name='post_comments'),
+    path('v1/categories/', views.category_list, name='category_list'),
+    path('v1/categories/<slug:slug>/',
+         views.category_detail, name='category_detail'),
+    path('v1/locations/', views.location_list, name='location_list'),
+]
@@ -0,0 +1,155 @@
+"""JSON API только для чтения (версия 1).
+
+Ответы собираются из словарей без шаблонизатора. Списки листаются
+курсором: непрозрачная строка cursor хранит ключ сортировки последнего
+объекта страницы, и следующая страница выбирается условием WHERE по
+этому ключу, без OFFSET. ETag строится из версии лент (core.cache),
+поэтому повторный запрос без изменений получает 304 без обращения к БД.
+"""
+from functools import wraps
+
+from django.core.exceptions import ValidationError
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import condition, require_GET
+
+from blog.models import Category, Comment, Location, Post
+from core.cache import feed_version_parts
+from core.cursors import after_cursor, decode_cursor, encode_cursor
+from core.utils import get_published_posts
+
+from .resources import (
+    CATEGORY_FIELDS, COMMENT_FIELDS, LOCATION_FIELDS, POST_FIELDS, ApiError,
+    apply_fields, select_fields, serialize
+)
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def api_etag(request, *args, **kwargs):
+    version, bucket = feed_version_parts()
+    return f'v1-{version}-{bucket}'
+
+
+def api_view(view):
+    @require_GET
+    @condition(etag_func=api_etag)
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as error:
+            return JsonResponse({'error': str(error)}, status=400)
+        except Http404:
+            return JsonResponse({'error': 'Не найдено.'}, status=404)
+    return wrapper
+
+
+def get_limit(request):
+    try:
+        limit = int(request.GET.get('limit', PAGE_SIZE))
+    except ValueError:
+        raise ApiError('limit должен быть числом.')
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def paginated(request, queryset, spec, ordering):
+    """Страница ресурса с выбранными полями и ссылкой на следующую."""
+    names = select_fields(spec, request.GET.get('fields'))
+    keys = [field.lstrip('-') for field in ordering]
+    queryset = apply_fields(queryset, spec, names, keys).order_by(*ordering)
+    cursor = request.GET.get('cursor')
+    if cursor:
+        try:
+            queryset = queryset.filter(
+                after_cursor(ordering, decode_cursor(cursor, len(ordering)))
+            )
+        except (ValueError, ValidationError):
+            raise ApiError('Некорректный курсор.')
+    limit = get_limit(request)
+    objects = list(queryset[:limit + 1])
+    next_url = None
+    if len(objects) > limit:
+        objects = objects[:limit]
+        params = request.GET.copy()
+        params['cursor'] = encode_cursor(
+            [getattr(objects[-1], key) for key in keys]
+        )
+        next_url = f'{request.path}?{params.urlencode()}'
+    return JsonResponse({
+        'results': [serialize(obj, spec, names) for obj in objects],
+        'next': next_url,
+    }, json_dumps_params={'ensure_ascii': False})
+
+
+def detail(request, queryset, spec, **lookup):
+    names = select_fields(spec, request.GET.get('fields'))
+    obj = get_object_or_404(apply_fields(queryset, spec, names), **lookup)
+    return JsonResponse(
+        serialize(obj, spec, names), json_dumps_params={'ensure_ascii': False}
+    )
+
+
+def visible_posts(request):
+    posts = get_published_posts(Post.objects.all())
+    filters = {
+        'category': 'category__slug',
+        'author': 'author__username',
+        'location': 'location_id',
+    }
+    if not request.GET.get('location', '0').isdigit():
+        raise ApiError('location должен быть числом.')
+    for param, lookup in filters.items():
+        if param in request.GET:
+            posts = posts.filter(**{lookup: request.GET[param]})
+    return posts
+
+
+@api_view
+def post_list(request):
+    return paginated(
+        request, visible_posts(request), POST_FIELDS, ('-pub_date', '-id')
+    )
+
+
+@api_view
+def post_detail(request, pk):
+    return detail(
+        request, get_published_posts(Post.objects.all()), POST_FIELDS, pk=pk
+    )
+
+
+@api_view
+def post_comments(request, pk):
+    post = get_object_or_404(
+        get_published_posts(Post.objects.all()).only('id'), pk=pk
+    )
+    return paginated(
+        request, Comment.objects.filter(post=post), COMMENT_FIELDS,
+        ('created_at', 'id'),
+    )
+
+
+@api_view
+def category_list(request):
+    return paginated(
+        request, Category.objects.filter(is_published=True),
+        CATEGORY_FIELDS, ('id',),
+    )
+
+
+@api_view
+def category_detail(request, slug):
+    return detail(
+        request, Category.objects.filter(is_published=True),
+        CATEGORY_FIELDS, slug=slug,
+    )
+
+
+@api_view
+def location_list(request):
+    return paginated(
+        request, Location.objects.filter(is_published=True),
+        LOCATION_FIELDS, ('id',),
+    )
@@ -1,9 +1,129 @@
 from django.contrib import admin
+from django.db.models import Q
+
+from core.admin import KeysetPaginationMixin
+from core.cache import bump_feed_version
+from core.export import export_response
+
+from . import sitemaps
+from .export import COMMENT_EXPORT_FIELDS, POST_EXPORT_FIELDS
 from .models import Category, Location, Post, Comment
 
 """ Регистрация моделей в админ-зоне. """
 
-admin.site.register(Category)
-admin.site.register(Location)
-admin.site.register(Post)
-admin.site.register(Comment)
+
+def prefix_filter(field, term):
+    """Поиск по началу строки диапазоном, который обслуживает индекс.
+
+    istartswith/icontains превращаются в LIKE, и индекс по полю не
+    используется; сравнение >= и < работает по индексу в любой БД.
+    """
+    return Q(**{f'{field}__gte': term, f'{field}__lt': term + '\U0010ffff'})
+
+
+SITEMAP_SECTIONS = {Post: 'posts', Category: 'categories'}
+
+
+def set_published(queryset, is_published):
+    # update() не отправляет сигналы, поэтому ленты сбрасываются, а
+    # шарды карты сайта помечаются явно. id читаются до update():
+    # queryset может быть отфильтрован по is_published.
+    pks = list(queryset.values_list('pk', flat=True))
+    queryset.update(is_published=is_published)
+    bump_feed_version()
+    section = SITEMAP_SECTIONS.get(queryset.model)
+    if section:
+        for pk in {sitemaps.shard_of(pk): pk for pk in pks}.values():
+            sitemaps.mark_dirty(section, pk)
+    if queryset.model is Category:
+        # Снятие категории с публикации меняет видимость её постов.
+        sitemaps.mark_dirty('posts')
+
+
+@admin.action(description='Опубликовать выбранные')
+def publish(modeladmin, request, queryset):
+    set_published(queryset, True)
+
+
+@admin.action(description='Снять с публикации выбранные')
+def unpublish(modeladmin, request, queryset):
+    set_published(queryset, False)
+
+
+@admin.action(description='Выгрузить выбранные в CSV')
+def export_csv(modeladmin, request, queryset):
+    return export_response(
+        queryset, modeladmin.export_fields, 'csv', modeladmin.opts.model_name
+    )
+
+
+@admin.action(description='Выгрузить выбранные в JSON Lines')
+def export_jsonl(modeladmin, request, queryset):
+    return export_response(
+        queryset, modeladmin.export_fields, 'jsonl',
+        modeladmin.opts.model_name
+    )
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ('title', 'slug', 'is_published', 'created_at')
+    list_filter = ('is_published',)
+    search_fields = ('title', 'slug')
+    prepopulated_fields = {'slug': ('title',)}
+    actions = (publish, unpublish)
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ('name', 'is_published', 'created_at')
+    list_filter = ('is_published',)
+    search_fields = ('name',)
+    actions = (publish, unpublish)
+
+
+@admin.register(Post)
+class PostAdmin(KeysetPaginationMixin, admin.ModelAdmin):
+    list_display = (
+        'title', 'author', 'category', 'location', 'is_published', 'pub_date'
+    )
+    list_select_related = ('author', 'category', 'location')
+    list_filter = ('is_published', 'category', 'pub_date')
+    raw_id_fields = ('author',)
+    autocomplete_fields = ('category', 'location')
+    search_fields = ('title',)
+    search_help_text = (
+        'Номер публикации, начало заголовка или точное имя автора.'
+    )
+    actions = (publish, unpublish, export_csv, export_jsonl)
+    export_fields = POST_EXPORT_FIELDS
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        if term.isdigit():
+            return queryset.filter(pk=int(term)), False
+        return queryset.filter(
+            prefix_filter('title', term) | Q(author__username=term)
+        ), False
+
+
+@admin.register(Comment)
+class CommentAdmin(KeysetPaginationMixin, admin.ModelAdmin):
+    list_display = ('__str__', 'author', 'post_id', 'created_at')
+    list_select_related = ('author',)
+    list_filter = ('created_at',)
+    raw_id_fields = ('author', 'post')
+    search_fields = ('author__username',)
+    search_help_text = 'Номер публикации или точное имя автора.'
+    actions = (export_csv, export_jsonl)
+    export_fields = COMMENT_EXPORT_FIELDS
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        if term.isdigit():
+            return queryset.filter(post_id=int(term)), False
+        return queryset.filter(author__username=term), False
@@ -0,0 +1,183 @@
+"""Асинхронные варианты представлений для чтения лент и постов.
+
+Используются при работе через ASGI (см. settings.BLOG_ASYNC_VIEWS):
+запросы к БД выполняются через асинхронный ORM, а шаблон рендерится
+прямо в цикле событий, поэтому все данные для шаблона загружаются
+заранее, до рендеринга. ETag, ответ 304 и кеш страниц лент - те же,
+что у синхронных представлений: валидаторы и кеш читаются через
+sync_to_async.
+"""
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponse
+from django.template import loader
+from django.utils import timezone
+
+from .forms import CommentForm
+from .models import Category, User
+from .views import CategoryView, PostDetailView, PostListView, ProfileView
+
+
+async def resolve_user(request):
+    """Загружает request.user в потоке, чтобы шаблон не обращался к БД."""
+    await sync_to_async(lambda: request.user.is_authenticated)()
+
+
+async def aget_object_or_404(queryset, **kwargs):
+    try:
+        return await queryset.aget(**kwargs)
+    except queryset.model.DoesNotExist:
+        raise Http404(
+            f'No {queryset.model._meta.object_name} matches the given query.'
+        )
+
+
+class AsyncConditionalGetMixin:
+    """Асинхронный get() для представлений с ConditionalGetMixin."""
+
+    async def get(self, request, *args, **kwargs):
+        await resolve_user(request)
+        etag, last_modified = await sync_to_async(self.get_validators)()
+        if etag is None and last_modified is None:
+            return await self.aget_full_response(request)
+
+        response = self.get_not_modified(request, etag, last_modified)
+        if response is None:
+            response = await self.aget_full_response(request)
+            if response.status_code != 200:
+                return response
+        return self.add_validators(response, etag, last_modified)
+
+    async def aget_full_response(self, request):
+        raise NotImplementedError
+
+
+class AsyncListMixin(AsyncConditionalGetMixin):
+    """Асинхронный get() для лент (CachedFeedMixin) с постраничным выводом."""
+
+    related_fields = ('author', 'category', 'location')
+
+    async def aget_full_response(self, request):
+        key, content = await sync_to_async(self.get_cached_page)(request)
+        if content is not None:
+            return HttpResponse(content)
+
+        await self.aprepare()
+        queryset = self.get_queryset().select_related(*self.related_fields)
+        context = await self.apaginate(queryset)
+        context.update(self.get_extra_context())
+        response = self.render(context)
+        if key:
+            await sync_to_async(self.cache_page)(key, response.content)
+        return response
+
+    async def aprepare(self):
+        """Загружает объекты, от которых зависит queryset."""
+
+    def get_extra_context(self):
+        return {}
+
+    async def apaginate(self, queryset):
+        paginator = self.get_paginator(queryset, self.paginate_by)
+        paginator.count = await queryset.acount()
+        page_number = (
+            self.kwargs.get(self.page_kwarg)
+            or self.request.GET.get(self.page_kwarg)
+            or 1
+        )
+        if page_number == 'last':
+            page_number = paginator.num_pages
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as error:
+            raise Http404(f'Invalid page ({page_number}): {error}')
+        page.object_list = [obj async for obj in page.object_list]
+        self.object_list = page.object_list
+        return {
+            'view': self,
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': page.has_other_pages(),
+            'object_list': page.object_list,
+        }
+
+    def render(self, context):
+        return HttpResponse(loader.render_to_string(
+            self.get_template_names(), context, self.request
+        ))
+
+
+class AsyncPostListView(AsyncListMixin, PostListView):
+    """Асинхронный вариант главной страницы."""
+
+
+class AsyncCategoryView(AsyncListMixin, CategoryView):
+    """Асинхронный вариант страницы категории."""
+
+    async def aprepare(self):
+        self.category = await aget_object_or_404(
+            Category.objects.all(),
+            slug=self.kwargs['category_slug'],
+            is_published=True,
+        )
+
+    def get_queryset(self):
+        return self.get_category_posts()
+
+    def get_extra_context(self):
+        return {'category': self.category}
+
+
+class AsyncProfileView(AsyncListMixin, ProfileView):
+    """Асинхронный вариант страницы профиля."""
+
+    async def aprepare(self):
+        self.author = await aget_object_or_404(
+            User.objects.all(), username=self.kwargs.get('username')
+        )
+
+    def get_queryset(self):
+        return self.get_author_posts()
+
+    def get_extra_context(self):
+        # is_following уже вычислен в get_validators().
+        return {'profile': self.author, 'is_following': self.is_following}
+
+
+class AsyncPostDetailView(AsyncConditionalGetMixin, PostDetailView):
+    """Асинхронный вариант страницы поста."""
+
+    async def aget_full_response(self, request):
+        post = await aget_object_or_404(
+            self.model.objects.select_related(
+                'location', 'category', 'author'
+            ),
+            pk=self.kwargs['pk'],
+        )
+        # Те же условия, что и в get_published_posts, но без
+        # повторного запроса к БД.
+        is_visible = (
+            post.is_published
+            and post.category is not None
+            and post.category.is_published
+            and post.pub_date <= timezone.now()
+        )
+        if post.author != request.user and not is_visible:
+            raise Http404('No Post matches the given query.')
+        self.object = post
+        context = {
+            'view': self,
+            'object': post,
+            'post': post,
+            'form': CommentForm(),
+            'comments': [
+                comment async for comment
+                in post.comments.select_related('author')
+            ],
+            'related_posts': [
+                related async for related in self.get_related_posts()
+            ],
+        }
+        return HttpResponse(loader.render_to_string(
+            self.get_template_names(), context, request
+        ))
@@ -0,0 +1,16 @@
+"""Поля выгрузки постов и комментариев (см. core.export)."""
+from .models import Comment, Post
+
+POST_EXPORT_FIELDS = (
+    'id', 'title', 'text', 'pub_date', 'author__username', 'category__slug',
+    'location__name', 'is_published', 'created_at',
+)
+
+COMMENT_EXPORT_FIELDS = (
+    'id', 'post_id', 'author__username', 'text', 'created_at',
+)
+
+EXPORTS = {
+    'posts': (Post, POST_EXPORT_FIELDS),
+    'comments': (Comment, COMMENT_EXPORT_FIELDS),
+}
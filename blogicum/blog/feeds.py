@@ -0,0 +1,142 @@
+"""RSS- и Atom-ленты главной, категорий и авторов.
+
+Готовая лента кешируется целиком под версией лент (core.cache), как и
+страницы лент для анонимных пользователей, поэтому любое изменение
+постов, категорий, локаций или пользователей её сбрасывает. ETag - хеш
+содержимого, Last-Modified - самое позднее время изменения поста в
+ленте (updated_at, а не pub_date: правка поста меняет и его), поэтому
+повторный запрос читателя лент обходится чтением из кеша и ответом 304.
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import parse_http_date_safe, quote_etag
+
+from core.cache import feed_cache, feed_cache_key
+from core.metrics import record_cache
+from core.utils import get_published_posts
+
+from .models import Category, Post, User
+
+
+class CachedFeed(Feed):
+    """Лента, которая кешируется целиком и отвечает на условный GET."""
+
+    items_limit = 20
+
+    def __call__(self, request, *args, **kwargs):
+        key = feed_cache_key('syndication', request)
+        entry = feed_cache().get(key)
+        record_cache('syndication', entry is not None)
+        if entry is None:
+            response = super().__call__(request, *args, **kwargs)
+            entry = {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'etag': quote_etag(
+                    hashlib.md5(response.content).hexdigest()
+                ),
+                'last_modified': response.get('Last-Modified'),
+            }
+            feed_cache().set(key, entry, settings.FEED_CACHE_TIMEOUT)
+
+        last_modified = entry['last_modified'] and parse_http_date_safe(
+            entry['last_modified']
+        )
+        response = get_conditional_response(
+            request, etag=entry['etag'], last_modified=last_modified
+        ) or HttpResponse(entry['content'], content_type=entry['content_type'])
+        response['ETag'] = entry['etag']
+        if entry['last_modified']:
+            response['Last-Modified'] = entry['last_modified']
+        return response
+
+    def get_posts(self, obj):
+        return get_published_posts(Post.objects.all())
+
+    def items(self, obj):
+        return self.get_posts(obj).select_related(
+            'author', 'category'
+        ).order_by('-pub_date')[:self.items_limit]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.text
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        # По нему Feed считает Last-Modified всей ленты.
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.username
+
+    def item_categories(self, item):
+        return [item.category.title]
+
+
+class LatestPostsFeed(CachedFeed):
+    title = 'Блогикум: новые публикации'
+    description = 'Последние публикации всех авторов.'
+
+    def link(self):
+        return reverse('blog:index')
+
+
+class CategoryPostsFeed(CachedFeed):
+    description = 'Последние публикации категории.'
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=[obj.slug])
+
+    def get_posts(self, obj):
+        return super().get_posts(obj).filter(category=obj)
+
+
+class AuthorPostsFeed(CachedFeed):
+    description = 'Последние публикации автора.'
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        return f'Блогикум: публикации {obj.username}'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=[obj.username])
+
+    def get_posts(self, obj):
+        return super().get_posts(obj).filter(author=obj)
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class CategoryPostsAtomFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = CategoryPostsFeed.description
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = AuthorPostsFeed.description
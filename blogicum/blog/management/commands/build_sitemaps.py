@@ -0,0 +1,89 @@
+import os
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog import sitemaps
+
+
+class Command(BaseCommand):
+    help = (
+        'Строит файлы карты сайта: при первом запуске или с --full все '
+        'шарды, иначе только помеченные как изменившиеся.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Перестроить все шарды, а не только изменившиеся.'
+        )
+
+    def take_dirty(self, directory):
+        """Забирает маркеры изменившихся шардов.
+
+        Маркер удаляется до перестройки: изменение во время работы
+        команды оставит новый маркер до следующего запуска.
+        """
+        shards = set()
+        for marker in (directory / 'dirty').glob('*'):
+            marker.unlink()
+            section, _, number = marker.name.partition('-')
+            if section not in sitemaps.SECTIONS:
+                continue
+            if number:
+                shards.add((section, int(number)))
+            else:
+                shards.update(
+                    (section, shard)
+                    for shard in sitemaps.section_shards(section)
+                )
+        return shards
+
+    def all_shards(self, directory):
+        for marker in (directory / 'dirty').glob('*'):
+            marker.unlink()
+        shards = {
+            (section, number)
+            for section in sitemaps.SECTIONS
+            for number in sitemaps.section_shards(section)
+        }
+        for path in directory.glob('*.xml'):
+            section, _, number = path.stem.partition('-')
+            if number and (section, int(number)) not in shards:
+                path.unlink()
+        return shards
+
+    def handle(self, *args, **options):
+        directory = sitemaps.sitemap_dir()
+        (directory / 'dirty').mkdir(parents=True, exist_ok=True)
+        last_build = directory / 'last_build'
+        started = timezone.now()
+
+        full = options['full'] or not (directory / 'sitemap.xml').exists()
+        if full:
+            shards = self.all_shards(directory)
+        else:
+            if last_build.exists():
+                sitemaps.mark_scheduled_posts(datetime.fromtimestamp(
+                    last_build.stat().st_mtime, dt_timezone.utc
+                ))
+            shards = self.take_dirty(directory)
+
+        for done, (section, number) in enumerate(sorted(shards), 1):
+            shard_started = time.perf_counter()
+            count = sitemaps.write_shard(section, number)
+            self.stdout.write(
+                f'[{done}/{len(shards)}] '
+                f'{sitemaps.shard_name(section, number)}: {count} адресов, '
+                f'{time.perf_counter() - shard_started:.2f} с'
+            )
+        sitemaps.write_index()
+
+        last_build.touch()
+        os.utime(last_build, (started.timestamp(), started.timestamp()))
+        self.stdout.write(self.style.SUCCESS(
+            f'Карта сайта обновлена: {len(shards)} шардов'
+            + (' (полная перестройка)' if full else '')
+        ))
@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.similarity import compute_related
+from core.cache import bump_related_version
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает похожие посты по TF-IDF близости текстов, '
+        'категории и местоположению.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-k', type=int, default=settings.RELATED_TOP_K,
+            help='Сколько похожих постов хранить для каждого поста.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=settings.RELATED_CHUNK_SIZE,
+            help='Сколько постов сравнивается за одно перемножение матриц.'
+        )
+        parser.add_argument(
+            '--max-features', type=int,
+            default=settings.RELATED_MAX_FEATURES,
+            help='Размер словаря TF-IDF.'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = compute_related(
+            options['top_k'], options['chunk_size'], options['max_features']
+        )
+        bump_related_version()
+        self.stdout.write(self.style.SUCCESS(
+            f'Похожие посты найдены для {count} постов '
+            f'за {time.perf_counter() - started:.1f} с'
+        ))
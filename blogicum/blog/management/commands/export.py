@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from blog.export import EXPORTS
+from core.export import FORMATS, export_chunks
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково выгружает посты или комментарии в CSV или JSON Lines, '
+        'не загружая всю таблицу в память.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=EXPORTS)
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument(
+            '--output', default='-',
+            help='Файл для выгрузки; по умолчанию стандартный вывод.'
+        )
+        parser.add_argument('--chunk-size', type=int)
+        parser.add_argument(
+            '--after-id', type=int,
+            help='Только объекты с id больше указанного.'
+        )
+
+    def handle(self, *args, **options):
+        model, fields = EXPORTS[options['model']]
+        queryset = model.objects.order_by('pk')
+        if options['after_id']:
+            queryset = queryset.filter(pk__gt=options['after_id'])
+        chunks = export_chunks(
+            queryset, fields, options['format'], options['chunk_size']
+        )
+        if options['output'] == '-':
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        output = options['output']
+        with open(output, 'w', encoding='utf-8', newline='') as file:
+            file.writelines(chunks)
+        self.stdout.write(self.style.SUCCESS(f'Выгрузка сохранена в {output}'))
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog import timeline
+
+
+class Command(BaseCommand):
+    help = (
+        'Рассылает ставшие видимыми посты по лентам подписок; '
+        'с --loop работает как постоянный воркер.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Сколько постов рассылать за один проход.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а ждать новых постов.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=10,
+            help='Пауза в секундах, когда рассылать нечего (для --loop).'
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            # Число подписчиков меняется: список знаменитостей
+            # пересчитывается на каждом проходе.
+            celebrities = timeline.refresh_celebrities()
+            done = timeline.fan_out(options['batch_size'])
+            total += done
+            if done:
+                self.stdout.write(
+                    f'Разослано постов: {done} '
+                    f'(знаменитостей: {len(celebrities)})'
+                )
+            if done < options['batch_size']:
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово: разослано постов {total}'
+        ))
@@ -0,0 +1,251 @@
+import random
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post, User
+
+
+WORDS = (
+    'день', 'утро', 'вечер', 'город', 'дорога', 'море', 'лес', 'кофе',
+    'книга', 'работа', 'отпуск', 'друзья', 'погода', 'снег', 'солнце',
+    'поезд', 'музей', 'концерт', 'ужин', 'прогулка', 'спорт', 'здоровье',
+    'кот', 'собака', 'сад', 'кухня', 'рецепт', 'фильм', 'сериал', 'игра',
+    'код', 'проект', 'идея', 'план', 'мечта', 'история', 'новость', 'мост',
+    'река', 'гора', 'озеро', 'остров', 'вокзал', 'рынок', 'парк', 'театр',
+    'неожиданно', 'снова', 'наконец', 'вчера', 'сегодня', 'завтра',
+    'быстро', 'медленно', 'тихо', 'громко', 'очень', 'совсем', 'почти',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует синтетический набор данных блога заданного масштаба '
+        'для нагрузочного тестирования.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--locations', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--comments', type=int, default=5000)
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Зерно генератора: одинаковое зерно даёт одинаковые данные.'
+        )
+        parser.add_argument(
+            '--anchor', type=date.fromisoformat, default=date(2024, 1, 1),
+            help=(
+                'Дата (ГГГГ-ММ-ДД), от которой назад отсчитываются даты '
+                'опубликованных постов и регистрации.'
+            )
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--future-ratio', type=float, default=0.05,
+            help=(
+                'Доля отложенных постов: их даты публикации отсчитываются '
+                'вперёд от следующих суток после запуска.'
+            )
+        )
+        parser.add_argument(
+            '--unpublished-ratio', type=float, default=0.1,
+            help='Доля снятых с публикации категорий, локаций и постов.'
+        )
+        parser.add_argument(
+            '--skew', type=float, default=1.1,
+            help='Показатель закона Ципфа для авторства и комментариев.'
+        )
+        parser.add_argument('--password', default='seed-password')
+
+    def handle(self, *args, **options):
+        for name in ('users', 'categories', 'posts'):
+            if options[name] < 1:
+                raise CommandError(f'--{name} должно быть больше нуля.')
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.options = options
+        self.prefix = f'seed{options["seed"]}'
+        if User.objects.filter(
+            username__startswith=f'{self.prefix}_user'
+        ).exists():
+            raise CommandError(
+                f'Данные с зерном {options["seed"]} уже созданы.'
+            )
+        # Прошлые даты отсчитываются от постоянной даты: одно и то же
+        # зерно в любой день даёт те же данные. Отложенные посты должны
+        # оставаться в будущем, поэтому их даты отсчитываются от начала
+        # следующих суток и совпадают при запусках в один день.
+        self.anchor = timezone.make_aware(
+            datetime.combine(options['anchor'], time.min)
+        )
+        self.future_anchor = timezone.make_aware(datetime.combine(
+            timezone.localdate() + timedelta(days=1), time.min
+        ))
+
+        user_ids = self.create_users()
+        category_ids = self.create_categories()
+        location_ids = self.create_locations()
+        post_ids = self.create_posts(user_ids, category_ids, location_ids)
+        self.create_comments(user_ids, post_ids)
+
+    def zipf_weights(self, size):
+        """Накопленные веса для выборки с тяжёлым хвостом."""
+        skew = self.options['skew']
+        return list(accumulate(1 / (rank ** skew)
+                               for rank in range(1, size + 1)))
+
+    def sentence(self, low, high):
+        words = self.rng.choices(WORDS, k=self.rng.randint(low, high))
+        return ' '.join(words).capitalize()
+
+    def is_published(self):
+        return self.rng.random() >= self.options['unpublished_ratio']
+
+    def bulk_create(self, model, objects, label, total):
+        """Сохраняет объекты пачками по batch_size."""
+        batch = []
+        created = 0
+        with transaction.atomic():
+            for obj in objects:
+                batch.append(obj)
+                if len(batch) >= self.batch_size:
+                    model.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+                    self.stdout.write(f'{label}: {created}/{total}')
+            if batch:
+                model.objects.bulk_create(batch)
+                created += len(batch)
+        self.stdout.write(self.style.SUCCESS(f'{label}: {created}'))
+
+    def create_users(self):
+        total = self.options['users']
+        password = make_password(self.options['password'])
+        self.bulk_create(
+            User,
+            (
+                User(
+                    username=f'{self.prefix}_user{number}',
+                    email=f'{self.prefix}_user{number}@example.com',
+                    password=password,
+                    date_joined=self.anchor - timedelta(
+                        days=self.rng.randint(0, 3 * 365)
+                    ),
+                )
+                for number in range(total)
+            ),
+            'Пользователи', total,
+        )
+        return list(
+            User.objects.filter(username__startswith=f'{self.prefix}_user')
+            .order_by('pk').values_list('pk', flat=True)
+        )
+
+    def create_categories(self):
+        total = self.options['categories']
+        self.bulk_create(
+            Category,
+            (
+                Category(
+                    title=self.sentence(1, 3),
+                    description=self.sentence(8, 20),
+                    slug=f'{self.prefix}-category-{number}',
+                    is_published=self.is_published(),
+                )
+                for number in range(total)
+            ),
+            'Категории', total,
+        )
+        return list(
+            Category.objects.filter(slug__startswith=f'{self.prefix}-')
+            .order_by('pk').values_list('pk', flat=True)
+        )
+
+    def create_locations(self):
+        total = self.options['locations']
+        first_pk = self.next_pk(Location)
+        self.bulk_create(
+            Location,
+            (
+                Location(
+                    name=self.sentence(1, 2),
+                    is_published=self.is_published(),
+                )
+                for _ in range(total)
+            ),
+            'Локации', total,
+        )
+        return list(
+            Location.objects.filter(pk__gte=first_pk)
+            .order_by('pk').values_list('pk', flat=True)
+        )
+
+    def create_posts(self, user_ids, category_ids, location_ids):
+        total = self.options['posts']
+        # Небольшая доля авторов пишет большую часть постов.
+        author_weights = self.zipf_weights(len(user_ids))
+        future_ratio = self.options['future_ratio']
+
+        def posts():
+            for _ in range(total):
+                if self.rng.random() < future_ratio:
+                    pub_date = self.future_anchor + timedelta(
+                        minutes=self.rng.randint(0, 60 * 24 * 30)
+                    )
+                else:
+                    pub_date = self.anchor - timedelta(
+                        minutes=self.rng.randint(0, 60 * 24 * 365)
+                    )
+                location = None
+                if location_ids and self.rng.random() < 0.8:
+                    location = self.rng.choice(location_ids)
+                yield Post(
+                    title=self.sentence(2, 6),
+                    text=self.sentence(20, 120),
+                    pub_date=pub_date,
+                    author_id=self.rng.choices(
+                        user_ids, cum_weights=author_weights
+                    )[0],
+                    category_id=self.rng.choice(category_ids),
+                    location_id=location,
+                    is_published=self.is_published(),
+                )
+
+        first_pk = self.next_pk(Post)
+        self.bulk_create(Post, posts(), 'Публикации', total)
+        return list(
+            Post.objects.filter(pk__gte=first_pk)
+            .order_by('pk').values_list('pk', flat=True)
+        )
+
+    def create_comments(self, user_ids, post_ids):
+        total = self.options['comments']
+        # Популярность постов не зависит от порядка их создания.
+        popular_posts = post_ids[:]
+        self.rng.shuffle(popular_posts)
+        post_weights = self.zipf_weights(len(popular_posts))
+        self.bulk_create(
+            Comment,
+            (
+                Comment(
+                    text=self.sentence(3, 30),
+                    author_id=self.rng.choice(user_ids),
+                    post_id=self.rng.choices(
+                        popular_posts, cum_weights=post_weights
+                    )[0],
+                )
+                for _ in range(total)
+            ),
+            'Комментарии', total,
+        )
+
+    @staticmethod
+    def next_pk(model):
+        last = model.objects.order_by('-pk').values_list('pk', flat=True)
+        return (last.first() or 0) + 1
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from blog import trending
+
+
+class Command(BaseCommand):
+    help = (
+        'Переводит оценки обсуждаемости в текущую эпоху и удаляет '
+        'затухшие; с --rebuild пересчитывает их по комментариям.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Пересчитать оценки заново (например, после развёртывания).'
+        )
+
+    def handle(self, *args, **options):
+        epoch = trending.current_epoch()
+        if options['rebuild']:
+            count = trending.rebuild(epoch)
+            self.stdout.write(f'Пересчитаны оценки {count} постов')
+        trending.rebase(epoch)
+        pruned = trending.prune(epoch)
+        self.stdout.write(self.style.SUCCESS(
+            f'Оценки обновлены, удалено затухших: {pruned}'
+        ))
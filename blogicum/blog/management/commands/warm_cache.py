@@ -0,0 +1,115 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from math import ceil
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Count, Q
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Category, Post, User
+from blog.views import PostListView
+from core.utils import get_published_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогревает кеш страниц лент: первые страницы главной, каждой '
+        'опубликованной категории и самых активных профилей.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages', type=int, default=3,
+            help='Сколько первых страниц каждой ленты прогревать.'
+        )
+        parser.add_argument(
+            '--profiles', type=int, default=20,
+            help='Сколько самых активных профилей прогревать.'
+        )
+        parser.add_argument('--workers', type=int, default=4)
+
+    def handle(self, *args, **options):
+        urls = self.collect_urls(options['pages'], options['profiles'])
+        self.stdout.write(f'Страниц для прогрева: {len(urls)}')
+
+        local = threading.local()
+
+        def fetch(url):
+            # Клиент не потокобезопасен: у каждого потока свой.
+            if not hasattr(local, 'client'):
+                local.client = Client(
+                    HTTP_HOST=settings.ALLOWED_HOSTS[0],
+                    raise_request_exception=False,
+                )
+            started = time.perf_counter()
+            try:
+                status = local.client.get(url).status_code
+            finally:
+                connections.close_all()
+            return url, status, time.perf_counter() - started
+
+        started = time.perf_counter()
+        failed = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = [executor.submit(fetch, url) for url in urls]
+            for done, future in enumerate(as_completed(futures), 1):
+                url, status, duration = future.result()
+                failed += status != 200
+                style = self.style.SUCCESS if status == 200 else (
+                    self.style.ERROR
+                )
+                self.stdout.write(style(
+                    f'[{done}/{len(urls)}] {status} {url} '
+                    f'{duration * 1000:.0f} мс'
+                ))
+        self.stdout.write(
+            f'Готово за {time.perf_counter() - started:.1f} с, '
+            f'ошибок: {failed}'
+        )
+
+    def page_urls(self, url, posts_count, pages):
+        total_pages = max(ceil(posts_count / PostListView.paginate_by), 1)
+        return [url] + [
+            f'{url}?page={number}'
+            for number in range(2, min(pages, total_pages) + 1)
+        ]
+
+    def collect_urls(self, pages, profiles):
+        urls = self.page_urls(
+            reverse('blog:index'),
+            get_published_posts(Post.objects.all()).count(),
+            pages,
+        )
+
+        visible = Q(
+            posts__is_published=True,
+            posts__pub_date__lte=timezone.now(),
+        )
+        categories = Category.objects.filter(is_published=True).annotate(
+            posts_count=Count('posts', filter=visible)
+        )
+        for category in categories:
+            urls += self.page_urls(
+                reverse('blog:category_posts', args=[category.slug]),
+                category.posts_count,
+                pages,
+            )
+
+        authors = User.objects.annotate(
+            posts_count=Count(
+                'posts',
+                filter=visible & Q(posts__category__is_published=True),
+            )
+        ).filter(posts_count__gt=0).order_by('-posts_count')[:profiles]
+        for author in authors:
+            urls += self.page_urls(
+                reverse('blog:profile', args=[author.username]),
+                author.posts_count,
+                pages,
+            )
+        return urls
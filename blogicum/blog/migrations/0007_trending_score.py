@@ -0,0 +1,27 @@
+# Generated by Django 4.2.17 on 2026-10-19 16:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_follow_timeline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='blog.post')),
+                ('score', models.FloatField(default=0)),
+                ('epoch', models.IntegerField()),
+            ],
+            options={
+                'verbose_name': 'оценка обсуждаемости',
+                'verbose_name_plural': 'Обсуждаемые публикации',
+                'indexes': [models.Index(fields=['epoch', '-score'], name='trending_epoch_score_idx')],
+            },
+        ),
+    ]
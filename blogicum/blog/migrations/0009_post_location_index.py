@@ -0,0 +1,17 @@
+# Generated by Django 4.2.17 on 2026-10-19 17:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_related_post'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['location', '-pub_date', '-id'], name='post_location_pub_date_idx'),
+        ),
+    ]
@@ -1,7 +1,16 @@
 from .models import Post, Comment
 from .forms import PostForm
+import hashlib
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from core.cache import feed_cache, feed_cache_key, feed_version_parts
+from core.metrics import record_cache
 
 
 class PostMixin:
@@ -12,6 +21,50 @@ class PostMixin:
     template_name = 'blog/create.html'
 
 
+class AuthorRequiredMixin:
+    """Миксин, пускающий к изменению и удалению объекта только автора.
+
+    Queryset ограничен объектами пользователя, поэтому авторство
+    проверяет сам запрос, которым обработчик UpdateView/DeleteView
+    загружает объект. Если объект не найден, отдельный запрос
+    выясняет, существует ли он: чужой объект - переход к посту,
+    несуществующий - 404.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(author_id=self.request.user.pk)
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return self.handle_not_author()
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except Http404:
+            return self.handle_not_author()
+
+    def handle_not_author(self):
+        pk = self.kwargs[self.pk_url_kwarg]
+        if not self.model.objects.filter(pk=pk).exists():
+            raise Http404
+        return redirect('blog:post_detail', self.kwargs['post_id'])
+
+
+class AuthorDeleteMixin(AuthorRequiredMixin):
+    """Удаление без загрузки объекта и страницы подтверждения.
+
+    POST выполняет DELETE ... WHERE id = ... AND author_id = ...;
+    объект загружается только для страницы подтверждения (GET).
+    """
+
+    def post(self, request, *args, **kwargs):
+        deleted, _ = self.get_queryset().filter(
+            pk=self.kwargs[self.pk_url_kwarg]
+        ).delete()
+        if not deleted:
+            raise Http404
+        return redirect(self.get_success_url())
+
+
 class CommentMixin:
     """Миксин для редактирования и удаления комментария."""
 
@@ -19,10 +72,96 @@ class CommentMixin:
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
 
-    def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != request.user:
-            return redirect('blog:post_detail', self.kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
-
     def get_success_url(self):
         return reverse('blog:post_detail', args=[self.kwargs['post_id']])
+
+
+class ConditionalGetMixin:
+    """Миксин условного GET: ответ 304 без запроса страницы из БД.
+
+    get_validators() возвращает ETag и время изменения, вычисленные
+    дешевле самой страницы; если клиент прислал совпадающие
+    If-None-Match или If-Modified-Since, страница не строится.
+    """
+
+    def get_validators(self):
+        """Пара (etag, last_modified); None - валидатора нет."""
+        return None, None
+
+    def get_etag(self, *parts):
+        # Страница зависит от пользователя, а форма на ней содержит
+        # CSRF-токен: они входят в ETag вместе с версией содержимого.
+        parts += (
+            self.request.user.pk,
+            self.request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+        )
+        data = '|'.join(str(part) for part in parts).encode()
+        return quote_etag(hashlib.md5(data).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        if etag is None and last_modified is None:
+            return self.get_full_response(request, *args, **kwargs)
+
+        response = self.get_not_modified(request, etag, last_modified)
+        if response is None:
+            response = self.get_full_response(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        return self.add_validators(response, etag, last_modified)
+
+    def get_not_modified(self, request, etag, last_modified):
+        """Ответ 304 (или 412), если валидаторы клиента совпали."""
+        response = get_conditional_response(
+            request, etag=etag,
+            last_modified=last_modified and int(last_modified.timestamp()),
+        )
+        record_cache('conditional_get', response is not None)
+        return response
+
+    def add_validators(self, response, etag, last_modified):
+        if etag:
+            response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(
+                int(last_modified.timestamp())
+            )
+        return response
+
+    def get_full_response(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class CachedFeedMixin(ConditionalGetMixin):
+    """Миксин, кеширующий страницы ленты для анонимных пользователей.
+
+    ETag страницы ленты строится из версии лент, поэтому повторный
+    запрос без изменений получает 304 после одного чтения из кеша.
+    """
+
+    def get_validators(self):
+        return self.get_etag(*feed_version_parts()), None
+
+    def get_full_response(self, request, *args, **kwargs):
+        key, content = self.get_cached_page(request)
+        if content is not None:
+            return HttpResponse(content)
+
+        response = super().get_full_response(request, *args, **kwargs)
+        if key and response.status_code == 200:
+            response.add_post_render_callback(
+                lambda rendered: self.cache_page(key, rendered.content)
+            )
+        return response
+
+    def get_cached_page(self, request):
+        """Ключ кеша и сохранённая страница; (None, None) - не кешируется."""
+        if request.user.is_authenticated:
+            return None, None
+        key = feed_cache_key('feed', request)
+        content = feed_cache().get(key)
+        record_cache('feed_page', content is not None)
+        return key, content
+
+    def cache_page(self, key, content):
+        feed_cache().set(key, content, settings.FEED_CACHE_TIMEOUT)
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.urls import reverse
 
 from core.models import PublishedModel
 
@@ -51,11 +52,45 @@ class Post(PublishedModel):
         null=True,
         blank=True
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено',
+    )
+    fanned_out = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Разослан в ленты подписчиков',
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date', 'title',)
+        indexes = (
+            models.Index(
+                fields=('is_published', '-pub_date'),
+                name='post_published_pub_date_idx',
+            ),
+            models.Index(fields=('-pub_date',), name='post_pub_date_idx'),
+            models.Index(fields=('title',), name='post_title_idx'),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_pub_date_idx',
+            ),
+            # Флаг публикации - условие частичного индекса: запрос
+            # проверяет его как булево значение, а не как равенство.
+            models.Index(
+                fields=('location', '-pub_date', '-id'),
+                condition=models.Q(is_published=True),
+                name='post_location_pub_date_idx',
+            ),
+            # Очередь команды fanout_timelines: только неразосланные.
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(fanned_out=False),
+                name='post_fanout_pending_idx',
+            ),
+        )
 
     def __str__(self) -> str:
         return (
@@ -65,6 +100,9 @@ class Post(PublishedModel):
             """
         )
 
+    def get_absolute_url(self):
+        return reverse('blog:post_detail', args=[self.pk])
+
 
 class Category(PublishedModel):
     """Модель для категории публикации."""
@@ -135,7 +173,135 @@ class Comment(models.Model):
         verbose_name_plural = "Комментарии"
         default_related_name = "comments"
         ordering = ("created_at",)
+        indexes = (
+            models.Index(
+                fields=("created_at",), name="comment_created_at_idx"
+            ),
+        )
 
     def __str__(self) -> str:
         text = str(self.text)
         return text[:20]
+
+
+class Follow(models.Model):
+    """Подписка пользователя на автора."""
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name='Подписчик',
+        related_name='following',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name='Автор',
+        related_name='followers',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+
+    class Meta:
+        verbose_name = 'подписка'
+        verbose_name_plural = 'Подписки'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'author'), name='follow_unique_user_author'
+            ),
+            models.CheckConstraint(
+                check=~models.Q(user=models.F('author')),
+                name='follow_not_self',
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.user} → {self.author}'
+
+
+class TimelineEntry(models.Model):
+    """Пост в ленте подписок пользователя (см. blog.timeline)."""
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        # Покрывается индексом timeline_user_pub_date_idx.
+        db_index=False,
+        related_name='timeline',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+    )
+    # Копия Post.pub_date: страница ленты читается одним индексом.
+    pub_date = models.DateTimeField()
+
+    class Meta:
+        verbose_name = 'запись ленты подписок'
+        verbose_name_plural = 'Ленты подписок'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'post'), name='timeline_unique_user_post'
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('user', '-pub_date', '-post'),
+                name='timeline_user_pub_date_idx',
+            ),
+        )
+
+
+class TrendingScore(models.Model):
+    """Оценка обсуждаемости поста (см. blog.trending)."""
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending',
+    )
+    # Сумма весов комментариев относительно начала эпохи epoch.
+    score = models.FloatField(default=0)
+    epoch = models.IntegerField()
+
+    class Meta:
+        verbose_name = 'оценка обсуждаемости'
+        verbose_name_plural = 'Обсуждаемые публикации'
+        indexes = (
+            models.Index(
+                fields=('epoch', '-score'), name='trending_epoch_score_idx'
+            ),
+        )
+
+
+class RelatedPost(models.Model):
+    """Похожий пост, найденный командой compute_related."""
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        # Покрывается ограничением related_post_unique_rank.
+        db_index=False,
+        related_name='related_posts',
+    )
+    related = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        verbose_name = 'похожая публикация'
+        verbose_name_plural = 'Похожие публикации'
+        ordering = ('rank',)
+        constraints = (
+            models.UniqueConstraint(
+                fields=('post', 'rank'), name='related_post_unique_rank'
+            ),
+        )
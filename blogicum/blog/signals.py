@@ -0,0 +1,80 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.cache import bump_feed_version
+
+from . import sitemaps, trending
+from .models import Category, Comment, Location, Post, TimelineEntry, User
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_feeds(sender, **kwargs):
+    """Сбрасывает закешированные страницы лент."""
+    bump_feed_version()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_feeds_on_user_change(sender, update_fields=None, **kwargs):
+    # Вход пользователя обновляет только last_login - ленты не меняются.
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    bump_feed_version()
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def touch_commented_post(sender, instance, **kwargs):
+    # Комментарии выводятся на странице поста: время изменения поста
+    # служит валидатором условного GET для неё.
+    Post.objects.filter(pk=instance.post_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Comment)
+def add_trending_comment(sender, instance, created, **kwargs):
+    if created:
+        trending.comment_created(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def remove_trending_comment(sender, instance, **kwargs):
+    trending.comment_deleted(instance)
+
+
+@receiver(post_save, sender=Post)
+def sync_timeline_pub_date(sender, instance, created, **kwargs):
+    # Ленты подписок сортируются по копии даты публикации.
+    if not created:
+        TimelineEntry.objects.filter(post=instance).exclude(
+            pub_date=instance.pub_date
+        ).update(pub_date=instance.pub_date)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def mark_post_sitemap(sender, instance, **kwargs):
+    sitemaps.mark_dirty('posts', instance.pk)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def mark_category_sitemap(sender, instance, **kwargs):
+    sitemaps.mark_dirty('categories', instance.pk)
+    # Снятие категории с публикации меняет видимость её постов.
+    sitemaps.mark_dirty('posts')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def mark_profile_sitemap(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    sitemaps.mark_dirty('profiles', instance.pk)
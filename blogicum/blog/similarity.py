@@ -0,0 +1,182 @@
+"""Поиск похожих постов для команды compute_related.
+
+Текст поста (заголовок с двойным весом и текст) превращается в вектор
+TF-IDF по словарю из RELATED_MAX_FEATURES слов, встречающихся хотя бы
+в двух постах и не более чем в половине. Косинусная близость
+считается перемножением матриц блоками по RELATED_CHUNK_SIZE постов,
+поэтому память ограничена размером блока, а не числом постов. К
+близости добавляются бонусы за общую категорию и местоположение, и
+для каждого поста сохраняются RELATED_TOP_K лучших соседей.
+
+Модуль импортирует NumPy и нужен только команде: веб-воркеры его не
+загружают.
+"""
+import math
+import re
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from core.utils import get_published_posts
+
+from .models import Post, RelatedPost
+
+WORD = re.compile(r'\w{3,}')
+
+
+def tokenize(title, text):
+    words = Counter(WORD.findall(text.lower()))
+    for word in WORD.findall(title.lower()):
+        words[word] += 2
+    return words
+
+
+def load_posts():
+    """id, категории, местоположения и слова видимых постов."""
+    rows = get_published_posts(Post.objects.all()).order_by('pk').values_list(
+        'pk', 'category_id', 'location_id', 'title', 'text'
+    )
+    ids, categories, locations, documents = [], [], [], []
+    for pk, category, location, title, text in rows.iterator(
+        chunk_size=2000
+    ):
+        ids.append(pk)
+        categories.append(category or 0)
+        locations.append(location or 0)
+        documents.append(tokenize(title, text))
+    return (
+        np.array(ids, dtype=np.int64),
+        np.array(categories, dtype=np.int64),
+        np.array(locations, dtype=np.int64),
+        documents,
+    )
+
+
+def build_vocabulary(documents, max_features):
+    frequency = Counter()
+    for words in documents:
+        frequency.update(words.keys())
+    limit = len(documents) / 2
+    common = [
+        (count, word) for word, count in frequency.items()
+        if 2 <= count <= max(limit, 2)
+    ]
+    common.sort(reverse=True)
+    terms = [word for _, word in common[:max_features]]
+    idf = np.array([
+        math.log((1 + len(documents)) / (1 + frequency[word])) + 1
+        for word in terms
+    ], dtype=np.float32)
+    return {word: index for index, word in enumerate(terms)}, idf
+
+
+def tfidf_rows(documents, vocabulary, idf):
+    """Строки TF-IDF в формате CSR: (indptr, indices, data)."""
+    indptr, indices, data = [0], [], []
+    for words in documents:
+        row = [
+            (vocabulary[word], 1 + math.log(count))
+            for word, count in words.items() if word in vocabulary
+        ]
+        row.sort()
+        indices.extend(index for index, _ in row)
+        data.extend(weight for _, weight in row)
+        indptr.append(len(indices))
+    indices = np.array(indices, dtype=np.int64)
+    data = np.array(data, dtype=np.float32) * idf[indices]
+    indptr = np.array(indptr, dtype=np.int64)
+    # Нормировка строк: скалярное произведение становится косинусом.
+    lengths = np.diff(indptr)
+    norms = np.sqrt(np.bincount(
+        np.repeat(np.arange(len(documents)), lengths),
+        weights=data ** 2, minlength=len(documents),
+    )).astype(np.float32)
+    norms[norms == 0] = 1
+    data /= np.repeat(norms, lengths)
+    return indptr, indices, data
+
+
+def dense_block(matrix, start, stop, width):
+    indptr, indices, data = matrix
+    block = np.zeros((stop - start, width), dtype=np.float32)
+    first, last = indptr[start], indptr[stop]
+    rows = np.repeat(np.arange(stop - start), np.diff(indptr[start:stop + 1]))
+    block[rows, indices[first:last]] = data[first:last]
+    return block
+
+
+def top_neighbours(matrix, width, categories, locations, top_k, chunk_size):
+    """Для каждого поста - индексы и оценки top_k лучших соседей."""
+    count = len(categories)
+    best_index = np.full((count, top_k), -1, dtype=np.int64)
+    best_score = np.full((count, top_k), -np.inf, dtype=np.float32)
+    for start in range(0, count, chunk_size):
+        stop = min(start + chunk_size, count)
+        queries = dense_block(matrix, start, stop, width)
+        for other in range(0, count, chunk_size):
+            other_stop = min(other + chunk_size, count)
+            scores = queries @ dense_block(matrix, other, other_stop, width).T
+            scores += settings.RELATED_CATEGORY_WEIGHT * (
+                categories[start:stop, None]
+                == categories[None, other:other_stop]
+            )
+            scores += settings.RELATED_LOCATION_WEIGHT * (
+                (locations[start:stop, None] != 0)
+                & (locations[start:stop, None]
+                   == locations[None, other:other_stop])
+            )
+            if start == other:
+                np.fill_diagonal(scores, -np.inf)
+            # Слияние с лучшими соседями из предыдущих блоков.
+            scores = np.concatenate((best_score[start:stop], scores), axis=1)
+            indexes = np.concatenate((
+                best_index[start:stop],
+                np.broadcast_to(
+                    np.arange(other, other_stop),
+                    (stop - start, other_stop - other),
+                ),
+            ), axis=1)
+            keep = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+            best_score[start:stop] = np.take_along_axis(scores, keep, axis=1)
+            best_index[start:stop] = np.take_along_axis(indexes, keep, axis=1)
+    order = np.argsort(-best_score, axis=1, kind='stable')
+    return (
+        np.take_along_axis(best_index, order, axis=1),
+        np.take_along_axis(best_score, order, axis=1),
+    )
+
+
+def compute_related(top_k=None, chunk_size=None, max_features=None):
+    """Пересчитывает RelatedPost для всех видимых постов.
+
+    Возвращает число постов, для которых найдены соседи.
+    """
+    top_k = top_k or settings.RELATED_TOP_K
+    ids, categories, locations, documents = load_posts()
+    vocabulary, idf = build_vocabulary(
+        documents, max_features or settings.RELATED_MAX_FEATURES
+    )
+    matrix = tfidf_rows(documents, vocabulary, idf)
+    rows = []
+    if len(ids) > 1:
+        neighbours, scores = top_neighbours(
+            matrix, len(vocabulary), categories, locations,
+            min(top_k, len(ids) - 1),
+            chunk_size or settings.RELATED_CHUNK_SIZE,
+        )
+        for post_id, indexes, values in zip(ids, neighbours, scores):
+            rank = 0
+            for index, score in zip(indexes, values):
+                if index < 0 or score <= 0:
+                    break
+                rows.append(RelatedPost(
+                    post_id=int(post_id), related_id=int(ids[index]),
+                    rank=rank, score=float(score),
+                ))
+                rank += 1
+    with transaction.atomic():
+        RelatedPost.objects.all().delete()
+        RelatedPost.objects.bulk_create(rows, batch_size=2000)
+    return len({row.post_id for row in rows})
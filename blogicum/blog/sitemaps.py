@@ -0,0 +1,162 @@
+"""Карта сайта, разбитая на файлы по диапазонам id.
+
+Секция (posts, categories, profiles) делится на шарды по
+SITEMAP_SHARD_SIZE идентификаторов: шард n содержит объекты с
+id в (n * size, (n + 1) * size], поэтому в нём не больше 50 000 адресов
+и объект всегда попадает в один и тот же файл. Шарды заранее пишутся в
+SITEMAP_DIR командой build_sitemaps; сигналы моделей помечают
+изменившиеся шарды файлами-маркерами в SITEMAP_DIR/dirty, и команда
+перестраивает только их.
+"""
+import os
+import re
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Max
+from django.urls import reverse
+from django.utils import timezone
+
+from core.utils import get_published_posts
+
+from .models import Category, Post, User
+
+SECTIONS = ('posts', 'categories', 'profiles')
+SHARD_NAME = re.compile(rf'^(?:{"|".join(SECTIONS)})-\d+$')
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def sitemap_dir():
+    return Path(settings.SITEMAP_DIR)
+
+
+def shard_size():
+    return getattr(settings, 'SITEMAP_SHARD_SIZE', 50000)
+
+
+def shard_name(section, number):
+    return f'{section}-{number}'
+
+
+def shard_of(pk):
+    return (pk - 1) // shard_size()
+
+
+def shard_path(name):
+    """Путь к файлу шарда или индекса; None для чужих имён."""
+    if name != 'sitemap' and not SHARD_NAME.match(name):
+        return None
+    return sitemap_dir() / f'{name}.xml'
+
+
+def absolute_url(path):
+    return settings.SITE_URL.rstrip('/') + path
+
+
+def mark_dirty(section, pk=None):
+    """Помечает шард объекта pk (или всю секцию) для перестройки."""
+    dirty = sitemap_dir() / 'dirty'
+    dirty.mkdir(parents=True, exist_ok=True)
+    name = section if pk is None else shard_name(section, shard_of(pk))
+    (dirty / name).touch()
+
+
+def section_entries(section, start, end):
+    """Адреса и даты изменения объектов секции с id в (start, end]."""
+    if section == 'posts':
+        rows = get_published_posts(
+            Post.objects.filter(pk__gt=start, pk__lte=end)
+        ).order_by('pk').values_list('pk', 'pub_date')
+        for pk, pub_date in rows.iterator(chunk_size=5000):
+            yield reverse('blog:post_detail', args=[pk]), pub_date
+    elif section == 'categories':
+        rows = Category.objects.filter(
+            pk__gt=start, pk__lte=end, is_published=True
+        ).order_by('pk').values_list('slug', 'created_at')
+        for slug, created_at in rows.iterator(chunk_size=5000):
+            yield reverse('blog:category_posts', args=[slug]), created_at
+    else:
+        rows = User.objects.filter(
+            pk__gt=start, pk__lte=end, is_active=True
+        ).order_by('pk').values_list('username', flat=True)
+        for username in rows.iterator(chunk_size=5000):
+            yield reverse('blog:profile', args=[username]), None
+
+
+def write_shard(section, number):
+    """Пишет шард во временный файл и подменяет им старый.
+
+    Возвращает число адресов; пустой шард удаляется.
+    """
+    size = shard_size()
+    path = sitemap_dir() / f'{shard_name(section, number)}.xml'
+    temporary = path.with_suffix('.tmp')
+    count = 0
+    with open(temporary, 'w', encoding='utf-8') as file:
+        file.write(
+            f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<urlset xmlns="{XMLNS}">\n'
+        )
+        for url, lastmod in section_entries(
+            section, number * size, (number + 1) * size
+        ):
+            lastmod = lastmod and f'<lastmod>{lastmod.date()}</lastmod>'
+            file.write(
+                f'<url><loc>{escape(absolute_url(url))}</loc>'
+                f'{lastmod or ""}</url>\n'
+            )
+            count += 1
+        file.write('</urlset>\n')
+    if count:
+        os.replace(temporary, path)
+    else:
+        temporary.unlink()
+        path.unlink(missing_ok=True)
+    return count
+
+
+def section_shards(section):
+    model = {'posts': Post, 'categories': Category, 'profiles': User}[section]
+    max_pk = model.objects.aggregate(max_pk=Max('pk'))['max_pk'] or 0
+    return range(shard_of(max_pk) + 1) if max_pk else range(0)
+
+
+def write_index():
+    directory = sitemap_dir()
+    temporary = directory / 'sitemap.xml.tmp'
+    with open(temporary, 'w', encoding='utf-8') as file:
+        file.write(
+            f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<sitemapindex xmlns="{XMLNS}">\n'
+        )
+        for section in SECTIONS:
+            shards = sorted(
+                directory.glob(f'{section}-*.xml'),
+                key=lambda path: int(path.stem.rsplit('-', 1)[1]),
+            )
+            for path in shards:
+                url = reverse('blog:sitemap_shard', args=[path.stem])
+                lastmod = datetime.fromtimestamp(
+                    path.stat().st_mtime, dt_timezone.utc
+                )
+                file.write(
+                    f'<sitemap><loc>{escape(absolute_url(url))}</loc>'
+                    f'<lastmod>{lastmod.isoformat()}</lastmod></sitemap>\n'
+                )
+        file.write('</sitemapindex>\n')
+    os.replace(temporary, directory / 'sitemap.xml')
+
+
+def mark_scheduled_posts(since):
+    """Помечает шарды постов, ставших видимыми после since.
+
+    Отложенная публикация появляется без сохранения поста, поэтому
+    сигнал её не замечает.
+    """
+    ids = Post.objects.filter(
+        pub_date__gt=since, pub_date__lte=timezone.now()
+    ).values_list('pk', flat=True)
+    for number in {shard_of(pk) for pk in ids.iterator()}:
+        mark_dirty('posts', number * shard_size() + 1)
@@ -0,0 +1,159 @@
+"""Лента подписок: рассылка при записи и слияние при чтении.
+
+Когда пост становится видимым, команда fanout_timelines записывает его
+в TimelineEntry каждого подписчика автора, и страница ленты читается
+по индексу (user, pub_date, post) без обхода таблицы постов. Посты
+«знаменитостей» - авторов с TIMELINE_CELEBRITY_FOLLOWERS подписчиков и
+больше - не рассылаются: страница ленты дочитывает их из Post по
+индексу (author, pub_date) и сливает с записями ленты. Каждая страница
+стоит одинаковое число запросов, как далеко бы ни листал читатель.
+"""
+import heapq
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.cursors import after_cursor, decode_cursor, encode_cursor
+from core.utils import get_published_posts
+
+from .models import Follow, Post, TimelineEntry
+
+CELEBRITIES_KEY = 'blog.timeline.celebrities'
+CELEBRITIES_TIMEOUT = 600
+
+
+def refresh_celebrities():
+    ids = set(
+        Follow.objects.values('author').annotate(
+            followers=Count('pk')
+        ).filter(
+            followers__gte=settings.TIMELINE_CELEBRITY_FOLLOWERS
+        ).values_list('author', flat=True)
+    )
+    cache.set(CELEBRITIES_KEY, ids, CELEBRITIES_TIMEOUT)
+    return ids
+
+
+def celebrities():
+    """Авторы, чьи посты читаются при показе ленты, а не рассылаются."""
+    ids = cache.get(CELEBRITIES_KEY)
+    return refresh_celebrities() if ids is None else ids
+
+
+def add_to_timelines(post_id, pub_date, user_ids):
+    batch_size = settings.TIMELINE_FANOUT_BATCH_SIZE
+    user_ids = iter(user_ids)
+    while batch := list(islice(user_ids, batch_size)):
+        TimelineEntry.objects.bulk_create(
+            [
+                TimelineEntry(user_id=user_id, post_id=post_id,
+                              pub_date=pub_date)
+                for user_id in batch
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def fan_out(limit):
+    """Рассылает до limit видимых постов; возвращает их число."""
+    posts = list(
+        get_published_posts(Post.objects.filter(fanned_out=False))
+        .order_by('pub_date').values_list('pk', 'author_id', 'pub_date')
+        [:limit]
+    )
+    skip = celebrities()
+    for post_id, author_id, pub_date in posts:
+        if author_id in skip:
+            continue
+        add_to_timelines(
+            post_id, pub_date,
+            Follow.objects.filter(author_id=author_id)
+            .values_list('user_id', flat=True)
+            .iterator(chunk_size=settings.TIMELINE_FANOUT_BATCH_SIZE),
+        )
+    Post.objects.filter(pk__in=[post[0] for post in posts]).update(
+        fanned_out=True
+    )
+    return len(posts)
+
+
+def backfill(user, author):
+    """Кладёт в ленту нового подписчика последние посты автора."""
+    if author.pk in celebrities():
+        return
+    posts = get_published_posts(author.posts.all()).order_by(
+        '-pub_date'
+    ).values_list('pk', 'pub_date')[:settings.TIMELINE_BACKFILL_POSTS]
+    for post_id, pub_date in posts:
+        add_to_timelines(post_id, pub_date, [user.pk])
+
+
+def forget(user, author):
+    TimelineEntry.objects.filter(user=user, post__author=author).delete()
+
+
+ORDERING = ('-pub_date', '-id')
+
+
+def page_keys(user, values, size):
+    """Ключи (pub_date, id) постов страницы, от новых к старым."""
+    entries = TimelineEntry.objects.filter(
+        user=user,
+        post__is_published=True,
+        post__category__is_published=True,
+        post__pub_date__lte=timezone.now(),
+    )
+    if values:
+        entries = entries.filter(
+            after_cursor(('-pub_date', '-post_id'), values)
+        )
+    sources = [
+        entries.order_by('-pub_date', '-post_id').values_list(
+            'pub_date', 'post_id'
+        )[:size]
+    ]
+    followed = list(Follow.objects.filter(
+        user=user, author__in=celebrities()
+    ).values_list('author_id', flat=True))
+    if followed:
+        posts = get_published_posts(Post.objects.filter(author__in=followed))
+        if values:
+            posts = posts.filter(after_cursor(ORDERING, values))
+        sources.append(
+            posts.order_by(*ORDERING).values_list('pub_date', 'id')[:size]
+        )
+
+    keys = []
+    # Автор мог стать знаменитостью уже после рассылки поста.
+    for key in heapq.merge(*sources, reverse=True):
+        if key not in keys[-1:]:
+            keys.append(key)
+    return keys[:size]
+
+
+def timeline_page(user, cursor=None, size=None):
+    """Посты страницы ленты и курсор следующей страницы (или None).
+
+    Для испорченного курсора - ValueError.
+    """
+    size = size or settings.TIMELINE_PAGE_SIZE
+    values = None
+    if cursor:
+        values = decode_cursor(cursor, len(ORDERING))
+        if parse_datetime(values[0]) is None or not values[1].isdigit():
+            raise ValueError('Некорректный курсор.')
+    keys = page_keys(user, values, size + 1)
+    next_cursor = None
+    if len(keys) > size:
+        keys = keys[:size]
+        next_cursor = encode_cursor(keys[-1])
+    posts = Post.objects.filter(pk__in=[pk for _, pk in keys]).select_related(
+        'author', 'category', 'location'
+    ).annotate(comment_count=Coalesce(Count('comments'), Value(0)))
+    posts = {post.pk: post for post in posts}
+    return [posts[pk] for _, pk in keys if pk in posts], next_cursor
@@ -0,0 +1,209 @@
+"""Обсуждаемые посты: оценка по комментариям с затуханием во времени.
+
+Комментарий, оставленный в момент t, весит 2 ** ((t - L) / T), где T -
+TRENDING_HALF_LIFE, а L - начало текущей эпохи длиной TRENDING_EPOCH
+(forward decay). Вес не меняется со временем, поэтому оценка поста -
+просто сумма весов: создание комментария прибавляет вес, удаление
+вычитает, и ничего не нужно пересчитывать по всей таблице
+комментариев. Порядок постов по такой сумме совпадает с порядком по
+оценке с затуханием «на сейчас».
+
+Изменения копятся в памяти процесса, и фоновый таймер записывает их в
+TrendingScore через TRENDING_FLUSH_INTERVAL секунд после первого из
+них; после записи версия лент увеличивается. При смене эпохи оценки
+домножаются на 2 ** (-TRENDING_EPOCH / T), чтобы числа не росли;
+команда update_trending делает это заранее и удаляет оценки,
+затухшие ниже TRENDING_MIN_SCORE.
+"""
+import atexit
+import threading
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.cache import bump_feed_version
+
+from .models import Comment, Post, TrendingScore
+
+
+def current_epoch(now=None):
+    now = now or timezone.now()
+    return int(now.timestamp() // settings.TRENDING_EPOCH)
+
+
+def weight(moment, epoch):
+    landmark = epoch * settings.TRENDING_EPOCH
+    return 2 ** ((moment.timestamp() - landmark) / settings.TRENDING_HALF_LIFE)
+
+
+def epoch_factor(old_epoch, new_epoch):
+    """Множитель, переводящий оценку из эпохи old_epoch в new_epoch."""
+    return 2 ** (
+        -(new_epoch - old_epoch) * settings.TRENDING_EPOCH
+        / settings.TRENDING_HALF_LIFE
+    )
+
+
+class Buffer:
+    """Изменения оценок текущего процесса, ещё не записанные в БД."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.deltas = defaultdict(float)
+        self.epoch = current_epoch()
+        self.timer = None
+
+    def add(self, post_id, moment, sign):
+        epoch = current_epoch()
+        if epoch != self.epoch:
+            self.flush()
+        interval = settings.TRENDING_FLUSH_INTERVAL
+        with self.lock:
+            self.epoch = epoch
+            self.deltas[post_id] += sign * weight(moment, epoch)
+            if interval and self.timer is None:
+                # Запись не ждёт следующего комментария в этом процессе.
+                self.timer = threading.Timer(interval, self.flush_on_timer)
+                self.timer.daemon = True
+                self.timer.start()
+        if not interval:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            deltas, self.deltas = self.deltas, defaultdict(float)
+            epoch = self.epoch
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+        if deltas:
+            save_deltas(deltas, epoch)
+
+    def flush_on_timer(self):
+        try:
+            self.flush()
+        finally:
+            # Поток таймера открывает собственное соединение с БД.
+            connection.close()
+
+
+buffer = Buffer()
+
+
+@atexit.register
+def _flush_on_exit():
+    if buffer.deltas:
+        try:
+            buffer.flush()
+        except Exception:
+            pass
+
+
+def comment_created(comment):
+    # Транзакция с комментарием может откатиться.
+    transaction.on_commit(
+        lambda: buffer.add(comment.post_id, comment.created_at, 1)
+    )
+
+
+def comment_deleted(comment):
+    transaction.on_commit(
+        lambda: buffer.add(comment.post_id, comment.created_at, -1)
+    )
+
+
+def rebase(epoch):
+    """Переводит оценки прошлых эпох в эпоху epoch."""
+    old_epochs = TrendingScore.objects.filter(
+        epoch__lt=epoch
+    ).values_list('epoch', flat=True).distinct()
+    for old_epoch in list(old_epochs):
+        TrendingScore.objects.filter(epoch=old_epoch).update(
+            score=F('score') * epoch_factor(old_epoch, epoch), epoch=epoch
+        )
+
+
+def save_deltas(deltas, delta_epoch):
+    """Прибавляет к оценкам изменения, посчитанные в эпохе delta_epoch."""
+    epoch = current_epoch()
+    rebase(epoch)
+    factor = epoch_factor(delta_epoch, epoch)
+    for post_id, delta in deltas.items():
+        delta *= factor
+        updated = TrendingScore.objects.filter(post_id=post_id).update(
+            score=F('score') + delta
+        )
+        if updated or delta <= 0:
+            continue
+        try:
+            with transaction.atomic():
+                TrendingScore.objects.create(
+                    post_id=post_id, score=delta, epoch=epoch
+                )
+        except IntegrityError:
+            # Пост удалён или строку успел создать другой процесс.
+            TrendingScore.objects.filter(post_id=post_id).update(
+                score=F('score') + delta
+            )
+    # Комментарий сбросил кеш лент сразу, а оценки записаны только
+    # сейчас: /trending/ могла закешироваться со старыми.
+    bump_feed_version()
+
+
+def prune(epoch, now=None):
+    """Удаляет оценки, затухшие ниже TRENDING_MIN_SCORE."""
+    threshold = settings.TRENDING_MIN_SCORE * weight(
+        now or timezone.now(), epoch
+    )
+    return TrendingScore.objects.filter(
+        epoch=epoch, score__lt=threshold
+    ).delete()[0]
+
+
+def rebuild(epoch, now=None):
+    """Пересчитывает оценки по комментариям последних 20 периодов T."""
+    now = now or timezone.now()
+    since = now - timedelta(seconds=20 * settings.TRENDING_HALF_LIFE)
+    scores = defaultdict(float)
+    comments = Comment.objects.filter(
+        created_at__gte=since
+    ).values_list('post_id', 'created_at')
+    for post_id, created_at in comments.iterator(chunk_size=5000):
+        scores[post_id] += weight(created_at, epoch)
+    with transaction.atomic():
+        TrendingScore.objects.all().delete()
+        TrendingScore.objects.bulk_create(
+            [
+                TrendingScore(post_id=post_id, score=score, epoch=epoch)
+                for post_id, score in scores.items()
+            ],
+            batch_size=1000,
+        )
+    return len(scores)
+
+
+def trending_posts(limit=None):
+    """Самые обсуждаемые видимые посты, от первого места к последнему."""
+    epoch = current_epoch()
+    # Обычно прошлых эпох нет, и это один запрос по индексу.
+    rebase(epoch)
+    ids = list(
+        TrendingScore.objects.filter(
+            epoch=epoch,
+            score__gt=0,
+            post__is_published=True,
+            post__category__is_published=True,
+            post__pub_date__lte=timezone.now(),
+        ).order_by('-score').values_list('post_id', flat=True)
+        [:limit or settings.TRENDING_SIZE]
+    )
+    posts = Post.objects.filter(pk__in=ids).select_related(
+        'author', 'category', 'location'
+    ).annotate(comment_count=Coalesce(Count('comments'), Value(0)))
+    posts = {post.pk: post for post in posts}
+    return [posts[pk] for pk in ids if pk in posts]
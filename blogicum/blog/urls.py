@@ -1,20 +1,46 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 app_name = 'blog'
 
+# При работе через ASGI ленты и страница поста обслуживаются
+# асинхронными представлениями. WSGI-воркер их не импортирует.
+if settings.BLOG_ASYNC_VIEWS:
+    from . import async_views
+
+    PostListView = async_views.AsyncPostListView
+    ProfileView = async_views.AsyncProfileView
+    PostDetailView = async_views.AsyncPostDetailView
+    CategoryView = async_views.AsyncCategoryView
+else:
+    PostListView = views.PostListView
+    ProfileView = views.ProfileView
+    PostDetailView = views.PostDetailView
+    CategoryView = views.CategoryView
+
 urlpatterns = [
-    path('', views.PostListView.as_view(), name='index'),
+    path('', PostListView.as_view(), name='index'),
 
     path('profile/<str:username>/',
-         views.ProfileView.as_view(), name='profile'),
+         ProfileView.as_view(), name='profile'),
+
+    path('profile/<str:username>/follow/',
+         views.follow, name='follow'),
+
+    path('profile/<str:username>/unfollow/',
+         views.unfollow, name='unfollow'),
+
+    path('timeline/', views.TimelineView.as_view(), name='timeline'),
+
+    path('trending/', views.TrendingView.as_view(), name='trending'),
 
     path('accounts/profile/',
          views.ProfileEditView.as_view(), name='edit_profile'),
 
 
-    path('', views.PostListView.as_view(), name='index'),
+    path('', PostListView.as_view(), name='index'),
 
     path('posts/create/',
          views.PostCreateView.as_view(), name='create_post'),
@@ -23,14 +49,40 @@ urlpatterns = [
          views.PostUpdateView.as_view(), name='edit_post'),
 
     path('posts/<int:pk>/',
-         views.PostDetailView.as_view(), name='post_detail'),
+         PostDetailView.as_view(), name='post_detail'),
 
     path('posts/<post_id>/delete/',
          views.PostDeleteView.as_view(), name='delete_post'),
 
 
     path('category/<slug:category_slug>/',
-         views.CategoryView.as_view(), name='category_posts'),
+         CategoryView.as_view(), name='category_posts'),
+
+
+    path('location/<int:location_id>/',
+         views.LocationView.as_view(), name='location_posts'),
+
+
+    path('feed/', feeds.LatestPostsFeed(), name='feed'),
+
+    path('feed/atom/', feeds.LatestPostsAtomFeed(), name='feed_atom'),
+
+    path('category/<slug:category_slug>/feed/',
+         feeds.CategoryPostsFeed(), name='category_feed'),
+
+    path('category/<slug:category_slug>/feed/atom/',
+         feeds.CategoryPostsAtomFeed(), name='category_feed_atom'),
+
+    path('profile/<str:username>/feed/',
+         feeds.AuthorPostsFeed(), name='profile_feed'),
+
+    path('profile/<str:username>/feed/atom/',
+         feeds.AuthorPostsAtomFeed(), name='profile_feed_atom'),
+
+
+    path('sitemap.xml', views.sitemap, name='sitemap'),
+
+    path('sitemaps/<slug:name>.xml', views.sitemap, name='sitemap_shard'),
 
 
     path('posts/<int:post_id>/comment/',
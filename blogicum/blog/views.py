@@ -1,17 +1,30 @@
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.http import FileResponse, Http404
 from django.shortcuts import get_object_or_404, redirect
 from django.utils import timezone
+from django.utils.functional import cached_property
+from django.views.decorators.http import require_POST
 from django.views.generic import (
-    ListView, CreateView, UpdateView, DeleteView, DetailView
+    ListView, CreateView, UpdateView, DeleteView, DetailView, TemplateView
 )
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse, reverse_lazy
-from django.db.models import Count, Value
+from django.db.models import Count, Max, OuterRef, Subquery, Sum, Value
 from django.db.models.functions import Coalesce
 
-from .models import Post, Category, Comment, User
+from .models import (
+    Post, Category, Comment, Follow, Location, RelatedPost, User
+)
 from .forms import PostForm, CommentForm, ProfileForm
-from .mixins import PostMixin, CommentMixin
+from . import sitemaps, timeline, trending
+from .mixins import (
+    AuthorDeleteMixin, AuthorRequiredMixin, CachedFeedMixin, CommentMixin,
+    ConditionalGetMixin, PostMixin
+)
 
+from core.cache import feed_version_parts, get_related_version
+from core.cursors import after_cursor, decode_cursor, encode_cursor
 from core.utils import get_published_posts
 
 
@@ -28,7 +41,7 @@ dispatch() - отвечает за маршрутизацию запроса к
 # Страница профиля и работа с ней
 
 
-class ProfileView(ListView):
+class ProfileView(CachedFeedMixin, ListView):
     """Отображает профиль пользователя и его записи."""
 
     model = Post
@@ -40,7 +53,10 @@ class ProfileView(ListView):
             User,
             username=self.kwargs.get('username')
         )
+        return self.get_author_posts()
 
+    def get_author_posts(self):
+        """Посты self.author, видимые текущему пользователю."""
         # пользователь просматривает страницу другого пользователя
         if self.author != self.request.user:
             return super().get_queryset().filter(
@@ -58,9 +74,65 @@ class ProfileView(ListView):
             comment_count=Coalesce(Count('comments'), Value(0))
         ).order_by('-pub_date')
 
+    @cached_property
+    def is_following(self):
+        user = self.request.user
+        return user.is_authenticated and Follow.objects.filter(
+            user=user, author__username=self.kwargs.get('username')
+        ).exists()
+
+    def get_validators(self):
+        # Кнопка подписки зависит от подписок текущего пользователя.
+        return self.get_etag(
+            *feed_version_parts(), self.is_following
+        ), None
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['profile'] = self.author
+        context['is_following'] = self.is_following
+        return context
+
+
+@require_POST
+@login_required
+def follow(request, username):
+    """Подписывает пользователя на автора."""
+    author = get_object_or_404(User, username=username)
+    if author != request.user:
+        _, created = Follow.objects.get_or_create(
+            user=request.user, author=author
+        )
+        if created:
+            timeline.backfill(request.user, author)
+    return redirect('blog:profile', username=username)
+
+
+@require_POST
+@login_required
+def unfollow(request, username):
+    """Отменяет подписку и убирает посты автора из ленты."""
+    author = get_object_or_404(User, username=username)
+    Follow.objects.filter(user=request.user, author=author).delete()
+    timeline.forget(request.user, author)
+    return redirect('blog:profile', username=username)
+
+
+class TimelineView(LoginRequiredMixin, TemplateView):
+    """Лента постов авторов, на которых подписан пользователь."""
+
+    template_name = 'blog/timeline.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        try:
+            posts, next_cursor = timeline.timeline_page(
+                self.request.user, self.request.GET.get('cursor')
+            )
+        except ValueError:
+            raise Http404('Некорректный курсор.')
+        context['posts'] = posts
+        context['next_cursor'] = next_cursor
         return context
 
 
@@ -98,27 +170,15 @@ class PostCreateView(PostMixin, LoginRequiredMixin, CreateView):
         return reverse("blog:profile", kwargs={"username": username})
 
 
-class PostUpdateView(PostMixin, LoginRequiredMixin, UpdateView):
+class PostUpdateView(
+    AuthorRequiredMixin, PostMixin, LoginRequiredMixin, UpdateView
+):
     """Отображает интерфейс редактирования поста + проверяет
     авторизирован ли пользователь и он ли автор поста.
     """
 
     pk_url_kwarg = 'post_id'
 
-    def dispatch(self, request, *args, **kwargs):
-
-        self.object = self.get_object()
-        is_auth_author = (self.request.user.is_authenticated
-                          and self.object.author == self.request.user)
-
-        if not is_auth_author:
-            pers_key = self.object.pk
-            return redirect(
-                reverse('blog:post_detail', kwargs={'pk': pers_key})
-            )
-        else:
-            return super().dispatch(request, *args, **kwargs)
-
     def get_success_url(self):
         pers_key = self.object.pk
         return reverse_lazy(
@@ -126,12 +186,56 @@ class PostUpdateView(PostMixin, LoginRequiredMixin, UpdateView):
         )
 
 
-class PostDetailView(DetailView):
+class PostDetailView(ConditionalGetMixin, DetailView):
     """Отображает содержание выбранного поста."""
 
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'pk'
+    validator_fields = (
+        'updated_at', 'author_id', 'is_published', 'pub_date',
+        'category__is_published', 'category__slug', 'category__title',
+        'location__is_published', 'location__name', 'author__username',
+    )
+
+    def get_validators(self):
+        """Валидаторы из одной строки поста и его связей.
+
+        Комментарии обновляют updated_at поста (blog.signals), а
+        выводимые на странице поля категории, локации и автора,
+        видимые похожие посты и версия рекомендаций входят в ETag.
+        Недоступный пост отдаётся обычным путём (404).
+        """
+        # Похожий пост мог быть скрыт, удалён или переименован без
+        # изменения этого поста: в ETag входят сумма id видимых похожих
+        # постов и последнее время их изменения.
+        related = self.get_related_posts().order_by().values('post_id')
+        row = self.model.objects.filter(pk=self.kwargs['pk']).annotate(
+            related_ids=Subquery(
+                related.annotate(value=Sum('related_id')).values('value')
+            ),
+            related_updated_at=Subquery(
+                related.annotate(
+                    value=Max('related__updated_at')
+                ).values('value')
+            ),
+        ).values(
+            *self.validator_fields, 'related_ids', 'related_updated_at'
+        ).first()
+        if row is None:
+            return None, None
+        visible = (
+            row['is_published'] and row['category__is_published']
+            and row['pub_date'] <= timezone.now()
+        )
+        if not visible and row['author_id'] != self.request.user.pk:
+            return None, None
+        last_modified = max(
+            row['updated_at'], row['related_updated_at'] or row['updated_at']
+        )
+        return self.get_etag(
+            *row.values(), get_related_version()
+        ), last_modified
 
     def get_object(self, queryset=None):
         object = super().get_object(
@@ -156,10 +260,20 @@ class PostDetailView(DetailView):
         context['comments'] = (
             self.object.comments.select_related('author')
         )
+        context['related_posts'] = self.get_related_posts()
         return context
 
+    def get_related_posts(self):
+        """Похожие посты, заранее найденные командой compute_related."""
+        return RelatedPost.objects.filter(
+            post_id=self.kwargs['pk'],
+            related__is_published=True,
+            related__category__is_published=True,
+            related__pub_date__lte=timezone.now(),
+        ).select_related('related').order_by('rank')
+
 
-class PostDeleteView(LoginRequiredMixin, DeleteView):
+class PostDeleteView(AuthorDeleteMixin, LoginRequiredMixin, DeleteView):
     """Отображает форму удаления поста + проверяет,
     пытается ли это сделать именно авторизированный автор поста.
     """
@@ -168,11 +282,6 @@ class PostDeleteView(LoginRequiredMixin, DeleteView):
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
 
-    def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != request.user:
-            return redirect('blog:post_detail', self.kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
-
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = PostForm(instance=self.object)
@@ -185,7 +294,7 @@ class PostDeleteView(LoginRequiredMixin, DeleteView):
         )
 
 
-class PostListView(ListView):
+class PostListView(CachedFeedMixin, ListView):
     """Отображает список постов главной страницы."""
 
     model = Post
@@ -203,9 +312,18 @@ class PostListView(ListView):
         return queryset
 
 
+class TrendingView(CachedFeedMixin, ListView):
+    """Отображает самые обсуждаемые посты."""
+
+    template_name = 'blog/trending.html'
+
+    def get_queryset(self):
+        return trending.trending_posts()
+
+
 # Страница категории
 
-class CategoryView(ListView):
+class CategoryView(CachedFeedMixin, ListView):
     """Отображает посты выбранной категории."""
 
     model = Post
@@ -218,7 +336,10 @@ class CategoryView(ListView):
             slug=self.kwargs['category_slug'],
             is_published=True
         )
+        return self.get_category_posts()
 
+    def get_category_posts(self):
+        """Опубликованные посты категории self.category."""
         return super().get_queryset().filter(
             is_published=True,
             category__is_published=True,
@@ -232,6 +353,66 @@ class CategoryView(ListView):
         return context
 
 
+# Страница местоположения
+
+class LocationView(CachedFeedMixin, ListView):
+    """Отображает посты выбранного местоположения.
+
+    Страницы листаются курсором по (pub_date, id): каждая страница -
+    один проход по индексу post_location_pub_date_idx без OFFSET.
+    """
+
+    model = Post
+    template_name = 'blog/location.html'
+    page_size = 10
+    ordering = ('-pub_date', '-id')
+
+    def get_queryset(self):
+        self.location = get_object_or_404(
+            Location,
+            pk=self.kwargs['location_id'],
+            is_published=True
+        )
+        # Подзапрос вместо Count('comments') с GROUP BY: порядок
+        # страницы берётся прямо из индекса, без сортировки.
+        comment_count = Comment.objects.filter(
+            post=OuterRef('pk')
+        ).values('post').annotate(count=Count('pk')).values('count')
+        return get_published_posts(
+            super().get_queryset().filter(location=self.location)
+        ).select_related(
+            'author', 'category', 'location'
+        ).annotate(
+            comment_count=Coalesce(Subquery(comment_count), Value(0))
+        )
+
+    def get_page(self, queryset):
+        """Посты страницы и курсор следующей страницы (или None)."""
+        cursor = self.request.GET.get('cursor')
+        if cursor:
+            try:
+                values = decode_cursor(cursor, len(self.ordering))
+                queryset = queryset.filter(
+                    after_cursor(self.ordering, values)
+                )
+                posts = list(queryset[:self.page_size + 1])
+            except (ValueError, ValidationError):
+                raise Http404('Некорректный курсор.')
+        else:
+            posts = list(queryset[:self.page_size + 1])
+        if len(posts) <= self.page_size:
+            return posts, None
+        posts = posts[:self.page_size]
+        return posts, encode_cursor((posts[-1].pub_date, posts[-1].pk))
+
+    def get_context_data(self, **kwargs):
+        posts, next_cursor = self.get_page(self.object_list)
+        context = super().get_context_data(object_list=posts, **kwargs)
+        context['location'] = self.location
+        context['next_cursor'] = next_cursor
+        return context
+
+
 # Комментарии и работа с ними
 
 
@@ -255,12 +436,27 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
                        kwargs={'pk': self.kwargs.get('post_id')})
 
 
-class CommentUpdateView(CommentMixin, LoginRequiredMixin, UpdateView):
+class CommentUpdateView(
+    AuthorRequiredMixin, CommentMixin, LoginRequiredMixin, UpdateView
+):
     """Отображает форму редактирования комментария."""
 
     form_class = CommentForm
     success_url = reverse_lazy('blog:index')
 
 
-class DeleteCommentView(CommentMixin, LoginRequiredMixin, DeleteView):
+class DeleteCommentView(
+    AuthorDeleteMixin, CommentMixin, LoginRequiredMixin, DeleteView
+):
     """Отображает форму удаления комментария."""
+
+
+# Карта сайта
+
+
+def sitemap(request, name='sitemap'):
+    """Отдаёт заранее построенный индекс или шард карты сайта."""
+    path = sitemaps.shard_path(name)
+    if path is None or not path.is_file():
+        raise Http404
+    return FileResponse(open(path, 'rb'), content_type='application/xml')
@@ -11,6 +11,13 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from core.warmup import warm_up
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+os.environ.setdefault('BLOGICUM_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
+
+# Шаблоны, URL-резолвер и подключения к БД готовятся до первого
+# запроса; с предзагрузкой приложения - один раз до fork воркеров.
+warm_up()
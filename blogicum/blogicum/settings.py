@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -27,6 +28,7 @@ INSTALLED_APPS = [
     'blog.apps.BlogConfig',
     'pages.apps.PagesConfig',
     'core.apps.CoreConfig',
+    'api.apps.ApiConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -35,21 +37,27 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
 
     'django_bootstrap5',
-    'debug_toolbar',
 ]
 
 MIDDLEWARE = [
+    'core.profiling.SamplingProfilerMiddleware',
+    'core.metrics.MetricsMiddleware',
+    'core.slow_queries.SlowQueryMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.auth.CachedAuthenticationMiddleware',
+    'core.throttling.ThrottleMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+# debug_toolbar нужен только при локальной разработке.
+if DEBUG:
+    INSTALLED_APPS += ['debug_toolbar']
+    MIDDLEWARE += ['debug_toolbar.middleware.DebugToolbarMiddleware']
+
 ROOT_URLCONF = 'blogicum.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
@@ -119,6 +127,158 @@ LOGIN_URL = 'login'
 
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма ставятся в очередь (core.mail) и отправляются командой
+# `manage.py send_outbox` через OUTBOX_DELIVERY_BACKEND: в боевом
+# окружении - django.core.mail.backends.smtp.EmailBackend.
+EMAIL_BACKEND = 'core.mail.OutboxBackend'
+
+OUTBOX_DELIVERY_BACKEND = os.getenv(
+    'BLOGICUM_EMAIL_DELIVERY_BACKEND',
+    'django.core.mail.backends.filebased.EmailBackend',
+)
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
+# Задержка перед повтором в секундах; удваивается с каждой попыткой.
+OUTBOX_RETRY_DELAY = 60
+# Сколько секунд взятое воркером письмо скрыто от других воркеров.
+OUTBOX_CLAIM_TIMEOUT = 300
+
+CACHES = {
+    'default': {
+        # Файловый кеш общий для всех воркеров на одном хосте.
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    # Страницы лент лежат отдельно: их вытеснение не затрагивает
+    # сессии и пользователей в default.
+    'feeds': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'feeds',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
+FEED_CACHE = 'feeds'
+
+SESSION_ENGINE = 'core.sessions'
+
+# Как часто (в секундах) сессия пользователя сохраняется в БД, если
+# в ней не менялись данные авторизации; 0 - при каждом изменении.
+SESSION_WRITE_BACK_INTERVAL = 300
+
+SESSION_CLEAR_BATCH_SIZE = 1000
+
+# Сколько секунд хранятся страницы лент для анонимных пользователей;
+# ограничивает и задержку появления отложенных публикаций.
+FEED_CACHE_TIMEOUT = 60
+
+# Лента подписок: посты авторов, у которых не меньше
+# TIMELINE_CELEBRITY_FOLLOWERS подписчиков, не рассылаются по лентам, а
+# читаются при показе страницы.
+TIMELINE_PAGE_SIZE = 10
+TIMELINE_CELEBRITY_FOLLOWERS = 10000
+TIMELINE_FANOUT_BATCH_SIZE = 1000
+# Сколько последних постов автора попадает в ленту при подписке.
+TIMELINE_BACKFILL_POSTS = 20
+
+# Обсуждаемые посты (blog.trending): вес комментария уменьшается вдвое
+# каждые TRENDING_HALF_LIFE секунд; длина эпохи, после которой оценки
+# перемасштабируются, и через сколько секунд процесс записывает
+# накопленные изменения в БД.
+TRENDING_HALF_LIFE = 6 * 60 * 60
+TRENDING_EPOCH = 24 * 60 * 60
+TRENDING_FLUSH_INTERVAL = 10
+TRENDING_SIZE = 20
+# Оценки ниже этой (в весах комментария «сейчас») удаляются.
+TRENDING_MIN_SCORE = 0.01
+
+# Похожие посты (`manage.py compute_related`): сколько соседей хранить,
+# размер словаря TF-IDF, размер блока при перемножении матриц и бонусы
+# к косинусной близости за общую категорию и местоположение.
+RELATED_TOP_K = 5
+RELATED_MAX_FEATURES = 20000
+RELATED_CHUNK_SIZE = 512
+RELATED_CATEGORY_WEIGHT = 0.1
+RELATED_LOCATION_WEIGHT = 0.05
+
+# Сколько секунд объект пользователя запроса хранится в кеше.
+AUTH_USER_CACHE_TIMEOUT = 300
+
+# Выборочное профилирование: в среднем один из PROFILER_SAMPLE_RATE
+# запросов (0 - выключено) и запросы с заголовком PROFILER_HEADER,
+# содержащим токен из `manage.py profile_report --token`.
+PROFILER_SAMPLE_RATE = 1000
+PROFILER_HEADER = 'X-Profile'
+PROFILER_INTERVAL = 0.005
+PROFILER_DIR = BASE_DIR / 'profiles'
+
+# Метрики Prometheus: каждый процесс сбрасывает свои метрики в
+# METRICS_DIR, эндпоинт /metrics суммирует их.
+METRICS_DIR = BASE_DIR / 'metrics'
+METRICS_FLUSH_INTERVAL = 5
+METRICS_ALLOWED_IPS = ['127.0.0.1']
+
+# Журнал медленных SQL-запросов; отчёт - `manage.py slowqueries`.
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_LOG = BASE_DIR / 'logs' / 'slow_queries.log'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'slow_queries': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': SLOW_QUERY_LOG,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'delay': True,
+            'formatter': 'message',
+        },
+    },
+    'loggers': {
+        'blogicum.slow_queries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
+# Асинхронные представления лент и поста; включаются в blogicum/asgi.py.
+BLOG_ASYNC_VIEWS = os.getenv('BLOGICUM_ASYNC_VIEWS') == '1'
+
+# Прогрев шаблонов, URL-резолвера и подключений к БД при загрузке
+# WSGI/ASGI-приложения (core.warmup).
+WARMUP_ON_STARTUP = os.getenv('BLOGICUM_WARMUP', '1') == '1'
+
+# Нормы запросов на запись по имени URL: жетонов на период (s, m, h, d).
+# Считаются по пользователю, для анонимных - по IP-адресу.
+THROTTLE_RATES = {
+    'login': '10/m',
+    'registration': '5/h',
+    'blog:create_post': '20/h',
+    'blog:add_comment': '10/m',
+}
+
+THROTTLE_CACHE = 'default'
+
+THROTTLE_VIEW = 'pages.views.too_many_requests'
+
+# Сколько строк выгрузки читается из БД и отдаётся клиенту за раз.
+EXPORT_CHUNK_SIZE = 2000
+
+# Адрес сайта для абсолютных ссылок в заранее построенных файлах.
+SITE_URL = os.getenv('BLOGICUM_SITE_URL', 'http://127.0.0.1:8000')
+
+# Карта сайта: файлы шардов строит команда build_sitemaps.
+SITEMAP_DIR = BASE_DIR / 'sitemaps'
+
+SITEMAP_SHARD_SIZE = 50000
@@ -21,6 +21,8 @@ from django.views.generic.edit import CreateView
 from django.conf.urls.static import static
 from django.conf import settings
 
+from core.views import metrics
+
 
 handler403 = 'pages.views.csrf_failure'
 handler404 = 'pages.views.page_not_found'
@@ -40,5 +42,7 @@ urlpatterns = [
     ),
     path('', include('blog.urls', namespace='blog')),
     path('pages/', include('pages.urls', namespace='pages')),
+    path('api/', include('api.urls', namespace='api')),
+    path('metrics', metrics, name='metrics'),
 
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -11,6 +11,12 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from core.warmup import warm_up
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
 application = get_wsgi_application()
+
+# Шаблоны, URL-резолвер и подключения к БД готовятся до первого
+# запроса; с предзагрузкой приложения - один раз до fork воркеров.
+warm_up()
@@ -0,0 +1,95 @@
+"""Список объектов в админке для больших таблиц.
+
+Стандартный ChangeList считает COUNT(*) дважды (с фильтрами и без) и
+листает страницы через OFFSET, поэтому на миллионах строк дальние
+страницы и сам подсчёт становятся медленными. KeysetChangeList
+листает по первичному ключу (WHERE id < курсор ORDER BY id DESC LIMIT
+n) и считает строки не дальше count_limit.
+"""
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
+
+AFTER_VAR = 'after'
+BEFORE_VAR = 'before'
+
+
+class KeysetChangeList(ChangeList):
+    """ChangeList с навигацией по курсору и ограниченным подсчётом."""
+
+    keyset = True
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(AFTER_VAR, None)
+        lookup_params.pop(BEFORE_VAR, None)
+        return lookup_params
+
+    def get_ordering(self, request, queryset):
+        return ['-pk']
+
+    def get_cursor(self, request, name):
+        value = request.GET.get(name)
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise IncorrectLookupParameters
+
+    def get_page(self, request):
+        """Строки страницы и наличие строк до и после неё."""
+        per_page = self.list_per_page
+        before = self.get_cursor(request, BEFORE_VAR)
+        if before is not None:
+            rows = list(
+                self.queryset.filter(pk__gt=before).order_by('pk')
+                [:per_page + 1]
+            )
+            return rows[:per_page][::-1], len(rows) > per_page, True
+        after = self.get_cursor(request, AFTER_VAR)
+        queryset = self.queryset
+        if after is not None:
+            queryset = queryset.filter(pk__lt=after)
+        rows = list(queryset[:per_page + 1])
+        return rows[:per_page], after is not None, len(rows) > per_page
+
+    def get_results(self, request):
+        rows, has_previous, has_next = self.get_page(request)
+        limit = self.model_admin.count_limit
+        result_count = self.queryset.order_by().values('pk')[
+            :limit + 1
+        ].count()
+
+        self.result_list = rows
+        self.result_count = min(result_count, limit)
+        self.result_count_capped = result_count > limit
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.can_show_all = False
+        self.multi_page = False
+        self.paginator = None
+        self.previous_url = has_previous and rows and self.get_query_string(
+            {BEFORE_VAR: rows[0].pk}, [AFTER_VAR]
+        )
+        self.next_url = has_next and rows and self.get_query_string(
+            {AFTER_VAR: rows[-1].pk}, [BEFORE_VAR]
+        )
+        self.first_url = self.get_query_string(
+            remove=[AFTER_VAR, BEFORE_VAR]
+        )
+
+
+class KeysetPaginationMixin:
+    """Миксин ModelAdmin: список через KeysetChangeList.
+
+    Сортировка по колонкам отключена: курсор работает только по
+    первичному ключу, новые объекты показываются первыми.
+    """
+
+    count_limit = 10000
+    show_full_result_count = False
+    sortable_by = ()
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
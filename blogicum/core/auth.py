@@ -0,0 +1,85 @@
+"""Определение пользователя запроса без обращения к БД.
+
+Объект пользователя кешируется по его id и сверяется с хешем пароля из
+сессии так же, как в django.contrib.auth.get_user. Запись в кеше
+удаляется при любом сохранении или удалении пользователя: это покрывает
+редактирование профиля, смену пароля и вход.
+"""
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import (
+    BACKEND_SESSION_KEY, HASH_SESSION_KEY, load_backend
+)
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from .metrics import record_cache
+
+
+def user_cache_key(user_id):
+    return f'core.auth.user:{user_id}'
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    cache.delete(user_cache_key(instance.pk))
+
+
+def get_backend_user(backend, user_id):
+    key = user_cache_key(user_id)
+    user = cache.get(key)
+    record_cache('auth_user', user is not None)
+    if user is None:
+        user = backend.get_user(user_id)
+        if user is not None:
+            cache.set(
+                key, user, getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 300)
+            )
+    return user
+
+
+def get_user(request):
+    """Аналог django.contrib.auth.get_user с кешированием пользователя."""
+    try:
+        user_id = auth._get_user_session_key(request)
+        backend_path = request.session[BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return AnonymousUser()
+
+    user = get_backend_user(load_backend(backend_path), user_id)
+    if not hasattr(user, 'get_session_auth_hash'):
+        return user or AnonymousUser()
+
+    session_hash = request.session.get(HASH_SESSION_KEY)
+    session_auth_hash = user.get_session_auth_hash()
+    if session_hash and constant_time_compare(
+        session_hash, session_auth_hash
+    ):
+        return user
+    if session_hash and any(
+        constant_time_compare(session_hash, fallback_auth_hash)
+        for fallback_auth_hash in user.get_session_auth_fallback_hash()
+    ):
+        request.session.cycle_key()
+        request.session[HASH_SESSION_KEY] = session_auth_hash
+        return user
+    request.session.flush()
+    return AnonymousUser()
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware, берущий пользователя из кеша."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: self.get_user(request))
+
+    @staticmethod
+    def get_user(request):
+        if not hasattr(request, '_cached_user'):
+            request._cached_user = get_user(request)
+        return request._cached_user
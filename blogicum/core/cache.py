@@ -0,0 +1,68 @@
+"""Версия лент для кеширования страниц.
+
+Все закешированные страницы лент хранятся под ключами с текущей
+версией; любое изменение постов, комментариев, категорий, локаций или
+пользователей увеличивает версию, и старые ключи больше не читаются.
+Страницы и версия хранятся в кеше FEED_CACHE, отдельном от сессий.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache, caches
+
+FEED_VERSION_KEY = 'core.cache.feed_version'
+RELATED_VERSION_KEY = 'core.cache.related_version'
+
+# Параметры запроса, от которых зависят страницы лент. Остальные в ключ
+# не входят, иначе запросы с произвольным ?x=N вытесняли бы кеш.
+FEED_QUERY_PARAMS = ('page', 'cursor')
+
+
+def feed_cache():
+    return caches[getattr(settings, 'FEED_CACHE', 'default')]
+
+
+def get_feed_version():
+    cache = feed_cache()
+    version = cache.get(FEED_VERSION_KEY)
+    if version is None:
+        # Начальное значение уникально, чтобы после сброса кеша
+        # не прочитать страницы, сохранённые под старой версией.
+        cache.add(FEED_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(FEED_VERSION_KEY)
+    return version
+
+
+def bump_feed_version():
+    cache = feed_cache()
+    try:
+        cache.incr(FEED_VERSION_KEY)
+    except ValueError:
+        cache.set(FEED_VERSION_KEY, time.time_ns(), None)
+
+
+def feed_version_parts():
+    """Версия лент и номер периода FEED_CACHE_TIMEOUT для ETag."""
+    # Отложенные публикации появляются без изменения версии, поэтому
+    # ETag меняется и по истечении FEED_CACHE_TIMEOUT.
+    return get_feed_version(), int(time.time()) // settings.FEED_CACHE_TIMEOUT
+
+
+def feed_cache_key(prefix, request):
+    query = urlencode([
+        (name, request.GET[name])
+        for name in FEED_QUERY_PARAMS if name in request.GET
+    ])
+    path = hashlib.md5(f'{request.path}?{query}'.encode()).hexdigest()
+    return f'{prefix}:{get_feed_version()}:{path}'
+
+
+def get_related_version():
+    """Версия рекомендаций похожих постов (команда compute_related)."""
+    return cache.get(RELATED_VERSION_KEY, 0)
+
+
+def bump_related_version():
+    cache.set(RELATED_VERSION_KEY, time.time_ns(), None)
@@ -0,0 +1,43 @@
+"""Курсоры для постраничного вывода без OFFSET.
+
+Курсор - непрозрачная строка с ключом сортировки последнего объекта
+страницы; следующая страница выбирается условием WHERE «строго после
+ключа», которое обслуживает индекс по полям сортировки.
+"""
+import base64
+import json
+
+from django.db.models import Q
+
+
+def encode_cursor(values):
+    data = json.dumps([str(value) for value in values]).encode()
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def decode_cursor(cursor, length):
+    """Значения ключа из курсора; ValueError для испорченного курсора."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError('Некорректный курсор.')
+    if (
+        not isinstance(values, list) or len(values) != length
+        or not all(isinstance(value, str) for value in values)
+    ):
+        raise ValueError('Некорректный курсор.')
+    return values
+
+
+def after_cursor(ordering, values):
+    """Условие «строго после ключа values» для сортировки ordering."""
+    where = Q()
+    for index, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        equal = {
+            previous.lstrip('-'): value
+            for previous, value in zip(ordering[:index], values)
+        }
+        where |= Q(**equal, **{f'{name}__{lookup}': values[index]})
+    return where
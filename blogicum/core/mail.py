@@ -0,0 +1,146 @@
+"""Отправка почты через очередь в БД.
+
+EMAIL_BACKEND проекта - OutboxBackend: send_mail() и сброс пароля
+только записывают письма в таблицу OutboxEmail и сразу возвращаются.
+Команда send_outbox забирает письма пачками по OUTBOX_BATCH_SIZE и
+отправляет их через OUTBOX_DELIVERY_BACKEND (SMTP или файловый бэкенд
+для локальной разработки) по одному открытому соединению. Неудачная
+попытка откладывает письмо с экспоненциально растущей задержкой;
+после OUTBOX_MAX_ATTEMPTS попыток письмо помечается неотправленным.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+from django.utils import timezone
+
+from .metrics import inc
+from .models import OutboxEmail
+
+
+class OutboxBackend(BaseEmailBackend):
+    """Бэкенд, который ставит письма в очередь вместо отправки."""
+
+    def send_messages(self, email_messages):
+        rows = [to_outbox(message) for message in email_messages]
+        OutboxEmail.objects.bulk_create(rows)
+        return len(rows)
+
+
+def to_outbox(message):
+    if message.attachments:
+        raise ValueError('Вложения в очереди писем не поддерживаются.')
+    return OutboxEmail(
+        subject=message.subject,
+        body=message.body,
+        from_email=message.from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(message.to),
+        cc=list(message.cc),
+        bcc=list(message.bcc),
+        reply_to=list(message.reply_to),
+        headers=dict(message.extra_headers),
+        alternatives=[
+            list(alternative)
+            for alternative in getattr(message, 'alternatives', ())
+        ],
+    )
+
+
+def from_outbox(email):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.to,
+        cc=email.cc,
+        bcc=email.bcc,
+        reply_to=email.reply_to,
+        headers=email.headers,
+    )
+    for content, mimetype in email.alternatives:
+        message.attach_alternative(content, mimetype)
+    return message
+
+
+def retry_delay(attempts):
+    """Задержка перед следующей попыткой: base, 2 * base, 4 * base..."""
+    return timedelta(seconds=settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def claim_batch(size):
+    """Забирает пачку писем, которым пора уходить.
+
+    Строки блокируются на время транзакции (в СУБД, где это есть), и
+    срок следующей попытки сдвигается, поэтому параллельный воркер
+    не возьмёт те же письма.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True).filter(
+                status=OutboxEmail.PENDING, next_attempt_at__lte=now
+            ).order_by('next_attempt_at', 'pk')[:size]
+        )
+        claimed_until = now + timedelta(seconds=settings.OUTBOX_CLAIM_TIMEOUT)
+        OutboxEmail.objects.filter(
+            pk__in=[email.pk for email in batch]
+        ).update(next_attempt_at=claimed_until)
+    return batch
+
+
+def record_failure(email, error):
+    email.last_error = f'{type(error).__name__}: {error}'
+    if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        email.status = OutboxEmail.FAILED
+    else:
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+
+
+def save_attempt(email):
+    inc('blogicum_outbox_emails_total', status=email.status)
+    email.save(update_fields=(
+        'attempts', 'status', 'sent_at', 'next_attempt_at', 'last_error'
+    ))
+
+
+def deliver(email, connection):
+    email.attempts += 1
+    try:
+        connection.send_messages([from_outbox(email)])
+    except Exception as error:
+        # После сбоя соединение может быть разорвано: следующее письмо
+        # откроет его заново.
+        connection.close()
+        record_failure(email, error)
+    else:
+        email.status = OutboxEmail.SENT
+        email.sent_at = timezone.now()
+        email.last_error = ''
+    save_attempt(email)
+    return email.status == OutboxEmail.SENT
+
+
+def send_outbox(batch_size=None):
+    """Отправляет одну пачку писем; возвращает (отправлено, ошибок)."""
+    batch = claim_batch(batch_size or settings.OUTBOX_BATCH_SIZE)
+    if not batch:
+        return 0, 0
+    connection = get_connection(settings.OUTBOX_DELIVERY_BACKEND)
+    try:
+        connection.open()
+    except Exception as error:
+        # Сервер недоступен: попытка засчитывается всей пачке.
+        for email in batch:
+            email.attempts += 1
+            record_failure(email, error)
+            save_attempt(email)
+        return 0, len(batch)
+    sent = 0
+    try:
+        for email in batch:
+            sent += deliver(email, connection)
+    finally:
+        connection.close()
+    return sent, len(batch) - sent
@@ -0,0 +1,184 @@
+import asyncio
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+MODES = ('wsgi', 'threaded', 'async')
+
+
+def wsgi_environ(url):
+    path, _, query = url.partition('?')
+    return {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'localhost',
+        'REMOTE_ADDR': '127.0.0.1',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+
+
+def asgi_scope(url):
+    path, _, query = url.partition('?')
+    return {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'headers': [(b'host', b'localhost')],
+        'client': ('127.0.0.1', 0),
+        'server': ('localhost', 80),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность и задержки при обслуживании '
+        'через WSGI, WSGI с пулом потоков и ASGI с асинхронными '
+        'представлениями.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', action='append', dest='paths',
+            help='Адрес для нагрузки; можно указать несколько раз.'
+        )
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument(
+            '--concurrency', default='1,4,16,64',
+            help='Уровни параллелизма через запятую.'
+        )
+        parser.add_argument(
+            '--mode', choices=MODES,
+            help='Запустить только один режим и вывести результат в JSON.'
+        )
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or ['/']
+        levels = [int(level) for level in options['concurrency'].split(',')]
+        if options['mode']:
+            results = self.run_mode(
+                options['mode'], paths, options['requests'], levels
+            )
+            self.stdout.write(json.dumps(results))
+            return
+
+        # Каждый режим запускается в отдельном процессе: набор
+        # представлений выбирается при импорте URLconf.
+        self.stdout.write(
+            f'{"режим":<10}{"параллелизм":>12}{"запр/с":>10}'
+            f'{"p50, мс":>10}{"p95, мс":>10}{"ошибки":>8}'
+        )
+        for mode in MODES:
+            env = dict(os.environ)
+            env['BLOGICUM_ASYNC_VIEWS'] = '1' if mode == 'async' else '0'
+            command = [
+                sys.executable, str(settings.BASE_DIR / 'manage.py'),
+                'bench_serving', '--mode', mode,
+                '--requests', str(options['requests']),
+                '--concurrency', options['concurrency'],
+            ]
+            for path in paths:
+                command += ['--path', path]
+            process = subprocess.run(
+                command, env=env, capture_output=True, text=True
+            )
+            if process.returncode:
+                raise CommandError(process.stderr)
+            for row in json.loads(process.stdout):
+                self.stdout.write(
+                    f'{mode:<10}{row["concurrency"]:>12}'
+                    f'{row["rps"]:>10.1f}{row["p50"]:>10.1f}'
+                    f'{row["p95"]:>10.1f}{row["errors"]:>8}'
+                )
+
+    def run_mode(self, mode, paths, total, levels):
+        if mode == 'async':
+            from django.core.asgi import get_asgi_application
+            app = get_asgi_application()
+            run = self.run_async
+        else:
+            from django.core.wsgi import get_wsgi_application
+            app = get_wsgi_application()
+            run = self.run_threaded
+        if mode == 'wsgi':
+            # Синхронный воркер обслуживает один запрос за раз.
+            levels = [1]
+        # Прогрев: шаблоны, URLconf и соединение с БД.
+        run(app, paths, len(paths), 1)
+        results = []
+        for level in levels:
+            started = time.perf_counter()
+            timings = run(app, paths, total, level)
+            elapsed = time.perf_counter() - started
+            latencies = sorted(duration for duration, _ in timings)
+            results.append({
+                'concurrency': level,
+                'rps': len(timings) / elapsed,
+                'p50': statistics.median(latencies) * 1000,
+                'p95': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+                'errors': sum(status >= 500 for _, status in timings),
+            })
+        return results
+
+    def run_threaded(self, app, paths, total, level):
+        def call(url):
+            status = []
+            started = time.perf_counter()
+            response = app(
+                wsgi_environ(url),
+                lambda code, headers: status.append(int(code.split()[0])),
+            )
+            b''.join(response)
+            response.close()
+            return time.perf_counter() - started, status[0]
+
+        with ThreadPoolExecutor(max_workers=level) as executor:
+            return list(executor.map(call, islice(cycle(paths), total)))
+
+    def run_async(self, app, paths, total, level):
+        async def call(url, semaphore):
+            status = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b''}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+
+            async with semaphore:
+                started = time.perf_counter()
+                await app(asgi_scope(url), receive, send)
+                return time.perf_counter() - started, status[0]
+
+        async def main():
+            semaphore = asyncio.Semaphore(level)
+            return await asyncio.gather(*(
+                call(url, semaphore)
+                for url in islice(cycle(paths), total)
+            ))
+
+        return asyncio.run(main())
@@ -0,0 +1,42 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.core.management.base import BaseCommand, CommandError
+
+from core.sessions import clear_expired_sessions
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет просроченные сессии пачками, не блокируя таблицу '
+        'django_session одним большим DELETE.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=getattr(settings, 'SESSION_CLEAR_BATCH_SIZE', 1000),
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0,
+            help='Пауза между пачками в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        if not issubclass(store, DBStore):
+            try:
+                store.clear_expired()
+            except NotImplementedError:
+                raise CommandError(
+                    f"Session engine '{settings.SESSION_ENGINE}' doesn't "
+                    'support clearing expired sessions.'
+                )
+            return
+        deleted = clear_expired_sessions(
+            store.get_model_class(),
+            batch_size=options['batch_size'],
+            pause=options['pause'],
+        )
+        self.stdout.write(f'Удалено сессий: {deleted}')
@@ -0,0 +1,75 @@
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.profiling import make_profile_token
+
+
+class Command(BaseCommand):
+    help = (
+        'Сводка по стекам, собранным SamplingProfilerMiddleware: самые '
+        'горячие функции по всем выборкам.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--view', help='Учитывать только выборки этого view.'
+        )
+        parser.add_argument('--limit', type=int, default=30)
+        parser.add_argument(
+            '--merge', metavar='FILE',
+            help='Сохранить объединённые стеки в folded-файл.'
+        )
+        parser.add_argument(
+            '--token', action='store_true',
+            help='Вывести токен для заголовка PROFILER_HEADER.'
+        )
+
+    def read_stacks(self, view):
+        directory = Path(settings.PROFILER_DIR)
+        pattern = '*.folded'
+        if view:
+            pattern = view.replace(':', '_') + '.*.folded'
+        files = sorted(directory.glob(pattern))
+        if not files:
+            raise CommandError(f'В {directory} нет выборок.')
+
+        stacks = Counter()
+        for path in files:
+            with open(path, encoding='utf-8') as file:
+                for line in file:
+                    stack, _, count = line.rstrip('\n').rpartition(' ')
+                    stacks[stack] += int(count)
+        return files, stacks
+
+    def handle(self, *args, **options):
+        if options['token']:
+            self.stdout.write(make_profile_token())
+            return
+
+        files, stacks = self.read_stacks(options['view'])
+        own = Counter()
+        total = Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(';')
+            own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+        samples = sum(stacks.values())
+
+        self.stdout.write(
+            f'Файлов: {len(files)}, выборок: {samples}\n'
+            f'{"своё %":>8}{"всего %":>9}  функция'
+        )
+        for frame, count in own.most_common(options['limit']):
+            self.stdout.write(
+                f'{100 * count / samples:>8.1f}'
+                f'{100 * total[frame] / samples:>9.1f}  {frame}'
+            )
+
+        if options['merge']:
+            with open(options['merge'], 'w', encoding='utf-8') as file:
+                for stack, count in stacks.items():
+                    file.write(f'{stack} {count}\n')
@@ -0,0 +1,72 @@
+import json
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Отчёт по журналу медленных SQL-запросов, сгруппированный по '
+        'отпечатку запроса.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--log', default=getattr(settings, 'SLOW_QUERY_LOG', None),
+            help='Путь к журналу; ротированные файлы читаются тоже.'
+        )
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument(
+            '--plans', action='store_true',
+            help='Показывать планы выполнения.'
+        )
+
+    def read_records(self, log):
+        log = Path(log)
+        paths = sorted(log.parent.glob(log.name + '*'))
+        if not paths:
+            raise CommandError(f'Журнал {log} не найден.')
+        for path in paths:
+            with open(path, encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+    def handle(self, *args, **options):
+        if not options['log']:
+            raise CommandError('Не задан SLOW_QUERY_LOG.')
+        groups = defaultdict(lambda: {
+            'count': 0, 'total': 0.0, 'max': 0.0, 'sql': '', 'plan': None,
+            'views': Counter(), 'sites': Counter(),
+        })
+        for record in self.read_records(options['log']):
+            group = groups[record['fingerprint']]
+            group['count'] += 1
+            group['total'] += record['duration_ms']
+            group['max'] = max(group['max'], record['duration_ms'])
+            group['sql'] = record['sql']
+            group['plan'] = record.get('plan') or group['plan']
+            group['views'][record.get('view')] += 1
+            group['sites'][record.get('call_site')] += 1
+
+        ranked = sorted(
+            groups.items(), key=lambda item: item[1]['total'], reverse=True
+        )
+        for key, group in ranked[:options['limit']]:
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{key}: {group["count"]} раз, всего {group["total"]:.1f} мс, '
+                f'в среднем {group["total"] / group["count"]:.1f} мс, '
+                f'максимум {group["max"]:.1f} мс'
+            ))
+            self.stdout.write(f'  {group["sql"][:500]}')
+            for view, count in group['views'].most_common(3):
+                self.stdout.write(f'  view: {view} ({count})')
+            for site, count in group['sites'].most_common(3):
+                self.stdout.write(f'  вызов: {site} ({count})')
+            if options['plans'] and group['plan']:
+                for row in group['plan']:
+                    self.stdout.write(f'  план: {row}')
@@ -0,0 +1,137 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Что импортирует процесс до готовности обслуживать запросы. URLconf
+# загружается лениво, поэтому резолвер заполняется явно.
+BOOT_SCRIPTS = {
+    'wsgi': 'from blogicum.wsgi import application',
+    'asgi': 'from blogicum.asgi import application',
+    'manage': 'import django; django.setup()',
+}
+BOOT_TEMPLATE = (
+    'import time; started = time.perf_counter()\n'
+    '{boot}\n'
+    'from django.urls import get_resolver; get_resolver().url_patterns\n'
+    'print(time.perf_counter() - started)\n'
+)
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(lines):
+    """Строит дерево импортов из вывода python -X importtime.
+
+    Модуль выводится после всех импортированных им модулей, поэтому
+    потомки собираются по уровню вложенности до появления родителя.
+    """
+    pending = {0: []}
+    for line in lines:
+        match = IMPORT_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        depth = len(indent) // 2
+        node = {
+            'name': name,
+            'self': int(self_us) / 1000,
+            'cumulative': int(cumulative_us) / 1000,
+            'children': pending.pop(depth + 1, []),
+        }
+        pending.setdefault(depth, []).append(node)
+    return pending[0]
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает дерево времени импорта модулей при запуске воркера '
+        'и общее время до готовности обслуживать запросы.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target', choices=BOOT_SCRIPTS, default='wsgi',
+            help='Что запускать: WSGI- или ASGI-приложение либо django.setup.'
+        )
+        parser.add_argument(
+            '--min-ms', type=float, default=5.0,
+            help='Не показывать модули с суммарным временем меньше порога.'
+        )
+        parser.add_argument('--depth', type=int, default=4)
+        parser.add_argument(
+            '--top', type=int, default=15,
+            help='Сколько модулей показать в списке по собственному времени.'
+        )
+        parser.add_argument(
+            '--runs', type=int, default=1,
+            help='Сколько раз запустить для замера времени запуска.'
+        )
+
+    def run_boot(self, target, importtime):
+        command = [sys.executable]
+        if importtime:
+            command += ['-X', 'importtime']
+        command += ['-c', BOOT_TEMPLATE.format(boot=BOOT_SCRIPTS[target])]
+        env = os.environ.copy()
+        env.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+        result = subprocess.run(
+            command, cwd=settings.BASE_DIR, env=env,
+            capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+        return float(result.stdout.strip().splitlines()[-1]), result.stderr
+
+    def write_tree(self, nodes, min_ms, depth, level=0):
+        for node in sorted(
+            nodes, key=lambda node: node['cumulative'], reverse=True
+        ):
+            if node['cumulative'] < min_ms:
+                continue
+            self.stdout.write(
+                f'{node["cumulative"]:9.1f} {node["self"]:8.1f}  '
+                f'{"  " * level}{node["name"]}'
+            )
+            if level + 1 < depth:
+                self.write_tree(node['children'], min_ms, depth, level + 1)
+
+    def write_top(self, roots, limit):
+        def walk(nodes):
+            for node in nodes:
+                yield node
+                yield from walk(node['children'])
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            'Модули с наибольшим собственным временем, мс:'
+        ))
+        for node in sorted(
+            walk(roots), key=lambda node: node['self'], reverse=True
+        )[:limit]:
+            self.stdout.write(f'{node["self"]:9.1f}  {node["name"]}')
+
+    def handle(self, *args, **options):
+        _, stderr = self.run_boot(options['target'], importtime=True)
+        roots = parse_importtime(stderr.splitlines())
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            'Время импорта, мс (суммарное, собственное):'
+        ))
+        self.write_tree(roots, options['min_ms'], options['depth'])
+        self.write_top(roots, options['top'])
+
+        # Замер без -X importtime: вывод дерева сам замедляет импорт.
+        timings = [
+            self.run_boot(options['target'], importtime=False)[0]
+            for _ in range(options['runs'])
+        ]
+        self.stdout.write(self.style.SUCCESS(
+            f'Импортов всего: '
+            f'{sum(node["cumulative"] for node in roots):.1f} мс; '
+            f'готов к работе через {statistics.median(timings) * 1000:.1f} мс '
+            f'(медиана из {len(timings)})'
+        ))
@@ -0,0 +1,257 @@
+"""Метрики в текстовом формате Prometheus.
+
+Каждый процесс копит метрики в памяти и не чаще раза в
+METRICS_FLUSH_INTERVAL секунд сбрасывает их в METRICS_DIR/<pid>.json.
+Эндпоинт /metrics суммирует файлы всех процессов, поэтому метрики
+корректны при любом числе воркеров на хосте.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .queries import execute_wrapper
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS = {
+    'blogicum_http_request_duration_seconds': (
+        'histogram', 'Время обработки запроса.'
+    ),
+    'blogicum_http_responses_total': (
+        'counter', 'Ответы по коду статуса.'
+    ),
+    'blogicum_db_queries_total': (
+        'counter', 'Число SQL-запросов.'
+    ),
+    'blogicum_db_query_duration_seconds_total': (
+        'counter', 'Суммарное время SQL-запросов.'
+    ),
+    'blogicum_template_render_duration_seconds': (
+        'histogram', 'Время рендеринга шаблона.'
+    ),
+    'blogicum_cache_requests_total': (
+        'counter', 'Обращения к кешу: попадания и промахи.'
+    ),
+    'blogicum_throttled_requests_total': (
+        'counter', 'Запросы, отклонённые ограничением частоты.'
+    ),
+    'blogicum_outbox_emails_total': (
+        'counter', 'Попытки отправки писем из очереди по итогу.'
+    ),
+}
+
+
+class Registry:
+    """Метрики текущего процесса."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.histograms = {}
+        self.flushed_at = 0
+
+    def inc(self, name, value=1, **labels):
+        with self.lock:
+            self.counters[name, tuple(sorted(labels.items()))] += value
+
+    def observe(self, name, value, **labels):
+        key = name, tuple(sorted(labels.items()))
+        with self.lock:
+            # Счётчики по корзинам, затем сумма и количество.
+            histogram = self.histograms.setdefault(
+                key, [0] * (len(BUCKETS) + 2)
+            )
+            for index, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    histogram[index] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'counters': [
+                    [name, dict(labels), value]
+                    for (name, labels), value in self.counters.items()
+                ],
+                'histograms': [
+                    [name, dict(labels), values]
+                    for (name, labels), values in self.histograms.items()
+                ],
+            }
+
+    def flush(self, force=False):
+        if not force and (
+            time.monotonic() - self.flushed_at
+            < getattr(settings, 'METRICS_FLUSH_INTERVAL', 5)
+        ):
+            return
+        self.flushed_at = time.monotonic()
+        directory = Path(settings.METRICS_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{os.getpid()}.json'
+        temporary = path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(self.snapshot()), encoding='utf-8')
+        os.replace(temporary, path)
+
+
+registry = Registry()
+inc = registry.inc
+observe = registry.observe
+
+
+def record_cache(cache_name, hit):
+    inc('blogicum_cache_requests_total', cache=cache_name,
+        result='hit' if hit else 'miss')
+
+
+@atexit.register
+def _flush_on_exit():
+    if registry.counters or registry.histograms:
+        try:
+            registry.flush(force=True)
+        except Exception:
+            pass
+
+
+def collect():
+    """Суммирует метрики всех процессов."""
+    registry.flush(force=True)
+    counters = defaultdict(float)
+    histograms = {}
+    for path in Path(settings.METRICS_DIR).glob('*.json'):
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            continue
+        for name, labels, value in data['counters']:
+            counters[name, tuple(sorted(labels.items()))] += value
+        for name, labels, values in data['histograms']:
+            key = name, tuple(sorted(labels.items()))
+            total = histograms.setdefault(key, [0] * len(values))
+            for index, value in enumerate(values):
+                total[index] += value
+    return counters, histograms
+
+
+def format_labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ''
+    escaped = (
+        str(value).replace('\\', r'\\').replace('"', r'\"')
+        .replace('\n', r'\n')
+        for _, value in pairs
+    )
+    return '{' + ','.join(
+        f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)
+    ) + '}'
+
+
+def render_text():
+    counters, histograms = collect()
+    lines = []
+    for name, (kind, description) in METRICS.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind == 'counter':
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{name}{format_labels(labels)} {value}')
+            continue
+        for (metric, labels), values in sorted(histograms.items()):
+            if metric != name:
+                continue
+            for bound, count in zip(BUCKETS, values):
+                lines.append(
+                    f'{name}_bucket{format_labels(labels, le=bound)} {count}'
+                )
+            lines.append(
+                f'{name}_bucket{format_labels(labels, le="+Inf")} '
+                f'{values[-1]}'
+            )
+            lines.append(f'{name}_sum{format_labels(labels)} {values[-2]}')
+            lines.append(f'{name}_count{format_labels(labels)} {values[-1]}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """Собирает время ответа, SQL-запросы и рендеринг шаблонов по view."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        queries, count_query = self.query_counter()
+        started = time.perf_counter()
+        with execute_wrapper(count_query):
+            response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - started, queries)
+        return response
+
+    async def __acall__(self, request):
+        queries, count_query = self.query_counter()
+        started = time.perf_counter()
+        with execute_wrapper(count_query):
+            response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - started, queries)
+        return response
+
+    @staticmethod
+    def query_counter():
+        queries = {'count': 0, 'duration': 0.0}
+
+        def count_query(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries['count'] += 1
+                queries['duration'] += time.perf_counter() - started
+
+        return queries, count_query
+
+    def record(self, request, response, duration, queries):
+        view = self.view_name(request)
+        observe('blogicum_http_request_duration_seconds', duration,
+                view=view, method=request.method)
+        inc('blogicum_http_responses_total',
+            view=view, status=response.status_code)
+        inc('blogicum_db_queries_total', queries['count'], view=view)
+        inc('blogicum_db_query_duration_seconds_total',
+            queries['duration'], view=view)
+        registry.flush()
+
+    @staticmethod
+    def view_name(request):
+        match = getattr(request, 'resolver_match', None)
+        return match.view_name if match else 'unresolved'
+
+    def process_template_response(self, request, response):
+        render = response.render
+
+        def timed_render():
+            started = time.perf_counter()
+            try:
+                return render()
+            finally:
+                observe('blogicum_template_render_duration_seconds',
+                        time.perf_counter() - started,
+                        view=self.view_name(request))
+
+        response.render = timed_render
+        return response
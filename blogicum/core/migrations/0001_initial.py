@@ -0,0 +1,41 @@
+# Generated by Django 4.2.17 on 2026-10-19 15:02
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.TextField(verbose_name='Тема')),
+                ('body', models.TextField(verbose_name='Текст')),
+                ('from_email', models.CharField(max_length=254, verbose_name='Отправитель')),
+                ('to', models.JSONField(default=list, verbose_name='Получатели')),
+                ('cc', models.JSONField(blank=True, default=list, verbose_name='Копия')),
+                ('bcc', models.JSONField(blank=True, default=list, verbose_name='Скрытая копия')),
+                ('reply_to', models.JSONField(blank=True, default=list, verbose_name='Адрес для ответа')),
+                ('headers', models.JSONField(blank=True, default=dict, verbose_name='Заголовки')),
+                ('alternatives', models.JSONField(blank=True, default=list, help_text='Пары [содержимое, MIME-тип], например HTML-версия.', verbose_name='Альтернативные версии')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('sent', 'Отправлено'), ('failed', 'Не отправлено')], default='pending', max_length=16, verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Следующая попытка')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Отправлено')),
+            ],
+            options={
+                'verbose_name': 'письмо',
+                'verbose_name_plural': 'Очередь писем',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_next_attempt_idx')],
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class PublishedModel(models.Model):
@@ -16,3 +17,66 @@ class PublishedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class OutboxEmail(models.Model):
+    """Письмо в очереди на отправку (см. core.mail)."""
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+    )
+
+    subject = models.TextField(verbose_name='Тема')
+    body = models.TextField(verbose_name='Текст')
+    from_email = models.CharField(max_length=254, verbose_name='Отправитель')
+    to = models.JSONField(default=list, verbose_name='Получатели')
+    cc = models.JSONField(default=list, blank=True, verbose_name='Копия')
+    bcc = models.JSONField(
+        default=list, blank=True, verbose_name='Скрытая копия'
+    )
+    reply_to = models.JSONField(
+        default=list, blank=True, verbose_name='Адрес для ответа'
+    )
+    headers = models.JSONField(
+        default=dict, blank=True, verbose_name='Заголовки'
+    )
+    alternatives = models.JSONField(
+        default=list, blank=True,
+        verbose_name='Альтернативные версии',
+        help_text='Пары [содержимое, MIME-тип], например HTML-версия.',
+    )
+    status = models.CharField(
+        max_length=16, choices=STATUSES, default=PENDING,
+        verbose_name='Статус',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попыток'
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now, verbose_name='Следующая попытка'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Добавлено'
+    )
+    sent_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Отправлено'
+    )
+
+    class Meta:
+        verbose_name = 'письмо'
+        verbose_name_plural = 'Очередь писем'
+        indexes = (
+            models.Index(
+                fields=('status', 'next_attempt_at'),
+                name='outbox_status_next_attempt_idx',
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.subject[:50]} → {", ".join(self.to)}'
@@ -0,0 +1,134 @@
+"""Выборочное профилирование запросов.
+
+Профилируется каждый PROFILER_SAMPLE_RATE-й (в среднем) запрос, а также
+запросы с подписанным заголовком PROFILER_HEADER. Пока запрос
+обрабатывается, фоновый поток раз в PROFILER_INTERVAL секунд снимает
+стек обрабатывающего потока. Стеки сохраняются в PROFILER_DIR в
+формате folded (строка «кадр;кадр;кадр число»), который понимают
+flamegraph.pl и speedscope.
+
+Асинхронные view (BLOG_ASYNC_VIEWS под ASGI) не профилируются: они
+выполняются в потоке цикла событий вместе с другими запросами, и стек
+этого потока нельзя отнести к одному запросу. Синхронные view под ASGI
+работают в том же потоке, что и process_request, и профилируются как
+обычно.
+"""
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.deprecation import MiddlewareMixin
+
+TOKEN_SALT = 'core.profiling'
+
+
+def make_profile_token():
+    """Токен для заголовка, включающего профилирование запроса."""
+    return signing.dumps('profile', salt=TOKEN_SALT)
+
+
+def frame_label(frame):
+    code = frame.f_code
+    path = code.co_filename
+    if path.startswith(str(settings.BASE_DIR)):
+        path = os.path.relpath(path, settings.BASE_DIR)
+    return f'{path}:{code.co_name}:{code.co_firstlineno}'
+
+
+class StackSampler:
+    """Периодически снимает стек заданного потока."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                self.stacks[';'.join(reversed(labels))] += 1
+
+
+class SamplingProfilerMiddleware(MiddlewareMixin):
+    """Снимает стеки выбранных запросов и сохраняет их по имени view."""
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.sample_rate = getattr(settings, 'PROFILER_SAMPLE_RATE', 0)
+        self.header = getattr(settings, 'PROFILER_HEADER', None)
+        if not self.sample_rate and not self.header:
+            raise MiddlewareNotUsed
+        self.interval = getattr(settings, 'PROFILER_INTERVAL', 0.005)
+        self.directory = settings.PROFILER_DIR
+
+    def should_profile(self, request):
+        token = self.header and request.headers.get(self.header)
+        if token:
+            try:
+                signing.loads(
+                    token, salt=TOKEN_SALT,
+                    max_age=getattr(settings, 'PROFILER_TOKEN_MAX_AGE', 3600),
+                )
+                return True
+            except signing.BadSignature:
+                pass
+        return bool(self.sample_rate) and (
+            random.random() * self.sample_rate < 1
+        )
+
+    def process_request(self, request):
+        if self.should_profile(request):
+            request._stack_sampler = StackSampler(
+                threading.get_ident(), self.interval
+            )
+            request._stack_sampler.start()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        sampler = getattr(request, '_stack_sampler', None)
+        if sampler is not None and iscoroutinefunction(view_func):
+            sampler.stop()
+            request._stack_sampler = None
+
+    def process_response(self, request, response):
+        sampler = getattr(request, '_stack_sampler', None)
+        if sampler is None:
+            return response
+        sampler.stop()
+        if sampler.stacks:
+            match = request.resolver_match
+            self.dump(match.view_name if match else 'unresolved',
+                      sampler.stacks)
+        return response
+
+    def dump(self, view_name, stacks):
+        os.makedirs(self.directory, exist_ok=True)
+        name = re.sub(r'[^\w.-]', '_', view_name)
+        path = os.path.join(
+            self.directory,
+            f'{name}.{time.time_ns()}.{os.getpid()}.folded',
+        )
+        with open(path, 'w', encoding='utf-8') as file:
+            for stack, count in stacks.items():
+                file.write(f'{stack} {count}\n')
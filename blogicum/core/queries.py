@@ -0,0 +1,49 @@
+"""Обёртки execute, действующие на время обработки запроса.
+
+connection.execute_wrapper() ставит обёртку только на соединение
+текущего потока, а под ASGI асинхронные view ходят в БД через
+sync_to_async из других потоков. Поэтому на каждое соединение один раз
+ставится общая обёртка, а обёртки текущего запроса хранятся в
+contextvars: sync_to_async переносит контекст в поток, где выполняется
+запрос к БД.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+_wrappers = ContextVar('core.queries.wrappers', default=())
+
+
+def run_wrappers(execute, sql, params, many, context):
+    # Первая установленная обёртка оказывается внешней, как у
+    # вложенных connection.execute_wrapper().
+    for wrapper in reversed(_wrappers.get()):
+        execute = partial(wrapper, execute)
+    return execute(sql, params, many, context)
+
+
+def install(connection, **kwargs):
+    if run_wrappers not in connection.execute_wrappers:
+        connection.execute_wrappers.append(run_wrappers)
+
+
+connection_created.connect(install)
+
+
+@contextmanager
+def execute_wrapper(wrapper):
+    """Ставит wrapper на запросы к БД из текущего контекста.
+
+    В отличие от connection.execute_wrapper() обёртка видит и запросы,
+    выполненные через sync_to_async.
+    """
+    # Соединение этого потока могло открыться до подключения сигнала.
+    install(connection)
+    token = _wrappers.set(_wrappers.get() + (wrapper,))
+    try:
+        yield
+    finally:
+        _wrappers.reset(token)
@@ -0,0 +1,151 @@
+"""Гибридное хранилище сессий.
+
+Сессии без авторизованного пользователя целиком хранятся в подписанной
+cookie и не затрагивают ни кеш, ни БД. Сессии пользователей читаются из
+кеша, а в БД попадают не чаще раза в SESSION_WRITE_BACK_INTERVAL секунд;
+смена пользователя или хеша пароля записывается в БД сразу.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.sessions.backends.cached_db import (
+    SessionStore as CachedDBStore
+)
+from django.core import signing
+from django.utils import timezone
+
+SIGNED_SALT = 'core.sessions'
+
+
+def clear_expired_sessions(model, batch_size=1000, pause=0):
+    """Удаляет просроченные сессии пачками, возвращает число удалённых."""
+    now = timezone.now()
+    deleted = 0
+    while True:
+        keys = list(
+            model.objects.filter(expire_date__lt=now)
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not keys:
+            return deleted
+        deleted += model.objects.filter(pk__in=keys).delete()[0]
+        if pause:
+            # Даём другим запросам получить блокировку на запись.
+            time.sleep(pause)
+
+
+class SessionStore(CachedDBStore):
+    """Подписанная cookie для анонимов, кеш с отложенной записью в БД
+    для пользователей.
+    """
+
+    cache_key_prefix = 'core.sessions'
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._loaded_auth_state = (None, None)
+
+    @staticmethod
+    def is_signed(session_key):
+        # Ключи серверных сессий состоят только из букв и цифр.
+        return bool(session_key) and ':' in session_key
+
+    @property
+    def write_back_interval(self):
+        return getattr(settings, 'SESSION_WRITE_BACK_INTERVAL', 0)
+
+    @property
+    def synced_key(self):
+        return self.cache_key + ':synced'
+
+    def auth_state(self, data):
+        return data.get(SESSION_KEY), data.get(HASH_SESSION_KEY)
+
+    def load(self):
+        if self.is_signed(self.session_key):
+            try:
+                data = signing.loads(
+                    self.session_key,
+                    salt=SIGNED_SALT,
+                    serializer=self.serializer,
+                    max_age=self.get_session_cookie_age(),
+                )
+            except Exception:
+                data = {}
+            # В cookie никогда не попадают данные авторизации.
+            data.pop(SESSION_KEY, None)
+        else:
+            data = super().load()
+        self._loaded_auth_state = self.auth_state(data)
+        return data
+
+    def exists(self, session_key):
+        if self.is_signed(session_key):
+            return False
+        return super().exists(session_key)
+
+    def save(self, must_create=False):
+        if SESSION_KEY not in self._session:
+            self._save_signed(must_create)
+            return
+        if self.is_signed(self.session_key):
+            self._session_key = None
+        if (
+            must_create
+            or self.session_key is None
+            or self._loaded_auth_state != self.auth_state(self._session)
+            or self._db_write_due()
+        ):
+            super().save(must_create)
+            self._loaded_auth_state = self.auth_state(self._session)
+            self._cache.set(
+                self.synced_key, time.time(), self.get_expiry_age()
+            )
+        else:
+            self._cache.set(
+                self.cache_key, self._session, self.get_expiry_age()
+            )
+
+    def _save_signed(self, must_create):
+        if (
+            not must_create
+            and self.session_key
+            and not self.is_signed(self.session_key)
+        ):
+            # Пользователь вышел: серверная копия больше не нужна.
+            self.delete(self.session_key)
+        self._session_key = signing.dumps(
+            self._session,
+            compress=True,
+            salt=SIGNED_SALT,
+            serializer=self.serializer,
+        )
+        self.modified = True
+
+    def _db_write_due(self):
+        if not self.write_back_interval:
+            return True
+        synced_at = self._cache.get(self.synced_key)
+        return (
+            synced_at is None
+            or time.time() - synced_at >= self.write_back_interval
+        )
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            session_key = self.session_key
+        if self.is_signed(session_key):
+            return
+        super().delete(session_key)
+        if session_key:
+            self._cache.delete(
+                self.cache_key_prefix + session_key + ':synced'
+            )
+
+    @classmethod
+    def clear_expired(cls):
+        clear_expired_sessions(
+            cls.get_model_class(),
+            batch_size=getattr(settings, 'SESSION_CLEAR_BATCH_SIZE', 1000),
+        )
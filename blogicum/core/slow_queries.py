@@ -0,0 +1,143 @@
+"""Журнал медленных SQL-запросов.
+
+Запросы дольше SLOW_QUERY_THRESHOLD_MS пишутся в логгер
+blogicum.slow_queries одной JSON-строкой: отпечаток запроса, типы
+параметров, view, место вызова в коде проекта и план выполнения.
+План запрашивается один раз на отпечаток в каждом процессе.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+from itertools import groupby
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+
+from .queries import execute_wrapper
+
+logger = logging.getLogger('blogicum.slow_queries')
+
+# Обёртки execute из этих модулей не считаются местом вызова.
+SKIP_MODULES = ('core/metrics.py', 'core/queries.py', 'core/slow_queries.py')
+
+IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+NUMBER = re.compile(r'\b\d+\b')
+
+
+def fingerprint(sql):
+    normalized = NUMBER.sub('?', IN_LIST.sub('IN (...)', sql))
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12], normalized
+
+
+def params_shape(params, many):
+    if many:
+        params = list(params)
+        return [f'executemany×{len(params)}']
+    if isinstance(params, dict):
+        return {key: type(value).__name__ for key, value in params.items()}
+    names = [type(value).__name__ for value in params or ()]
+    return [
+        name if count == 1 else f'{name}×{count}'
+        for name, count in (
+            (name, len(list(group))) for name, group in groupby(names)
+        )
+    ]
+
+
+def call_site(request):
+    """Первый кадр стека из кода проекта, не считая обёрток execute.
+
+    Если запрос выполняется вне кода проекта (ленивый queryset в
+    шаблоне или в generic view), указывается класс view.
+    """
+    base_dir = str(settings.BASE_DIR)
+    frame = sys._getframe(2)
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if path.startswith(base_dir) and 'site-packages' not in path:
+            relative = os.path.relpath(path, base_dir)
+            if not relative.replace(os.sep, '/').endswith(SKIP_MODULES):
+                return f'{relative}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    view = getattr(match.func, 'view_class', match.func)
+    return f'{view.__module__}.{view.__qualname__}'
+
+
+def explain(sql, params):
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    try:
+        with connection.cursor() as cursor:
+            # Курсор драйвера: без обёрток execute и без рекурсии.
+            cursor.cursor.execute(
+                f'{connection.ops.explain_query_prefix()} {sql}', params
+            )
+            return [' | '.join(map(str, row)) for row in cursor.fetchall()]
+    except Exception as error:
+        return [f'EXPLAIN failed: {error}']
+
+
+class SlowQueryMiddleware:
+    """Пишет в журнал SQL-запросы дольше SLOW_QUERY_THRESHOLD_MS."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.threshold = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 100)
+        self.explained = set()
+        log_file = getattr(settings, 'SLOW_QUERY_LOG', None)
+        if log_file:
+            os.makedirs(os.path.dirname(log_file), exist_ok=True)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with execute_wrapper(self.query_logger(request)):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with execute_wrapper(self.query_logger(request)):
+            return await self.get_response(request)
+
+    def query_logger(self, request):
+        def log_slow_query(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                duration = (time.perf_counter() - started) * 1000
+                if duration >= self.threshold:
+                    self.log(request, sql, params, many, duration)
+
+        return log_slow_query
+
+    def log(self, request, sql, params, many, duration):
+        key, normalized = fingerprint(sql)
+        plan = None
+        if key not in self.explained and not many:
+            self.explained.add(key)
+            plan = explain(sql, params)
+        match = getattr(request, 'resolver_match', None)
+        logger.warning(json.dumps({
+            'time': time.time(),
+            'fingerprint': key,
+            'duration_ms': round(duration, 3),
+            'sql': normalized,
+            'params': params_shape(params, many),
+            'view': match.view_name if match else None,
+            'path': request.path,
+            'call_site': call_site(request),
+            'plan': plan,
+        }, ensure_ascii=False))
@@ -0,0 +1,70 @@
+"""Ограничение частоты запросов на запись.
+
+Для имён URL из THROTTLE_RATES каждый запрос с методом, отличным от
+GET/HEAD/OPTIONS, забирает жетон из «ведра»: у авторизованного
+пользователя ведро своё, у анонимного - общее на IP-адрес. Ведро
+вмещает столько жетонов, сколько указано в норме ('10/m' - десять
+запросов), и равномерно пополняется за период. Состояние ведра лежит в
+кеше THROTTLE_CACHE: локальный или файловый кеш годится для одного
+хоста, для нескольких нужен общий. Чтение и запись ведра не атомарны,
+поэтому при одновременных запросах клиент может получить несколько
+лишних жетонов.
+"""
+import time
+from math import ceil
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.module_loading import import_string
+
+from .metrics import inc
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def parse_rate(rate):
+    """'10/m' -> (10, 60): объём ведра и период пополнения в секундах."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+def take_token(key, rate, cache=None):
+    """Забирает жетон; возвращает 0 или сколько секунд ждать жетона."""
+    cache = cache or caches[getattr(settings, 'THROTTLE_CACHE', 'default')]
+    capacity, period = parse_rate(rate)
+    now = time.time()
+    tokens, updated_at = cache.get(key, (capacity, now))
+    tokens = min(capacity, tokens + (now - updated_at) * capacity / period)
+    if tokens >= 1:
+        cache.set(key, (tokens - 1, now), period)
+        return 0
+    cache.set(key, (tokens, now), period)
+    return (1 - tokens) * period / capacity
+
+
+def client_ident(request):
+    if request.user.is_authenticated:
+        return 'user', str(request.user.pk)
+    return 'ip', request.META.get('REMOTE_ADDR', '')
+
+
+class ThrottleMiddleware(MiddlewareMixin):
+    """Отвечает 429, если клиент исчерпал норму запросов к адресу."""
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method in SAFE_METHODS:
+            return None
+        view_name = request.resolver_match.view_name
+        rate = getattr(settings, 'THROTTLE_RATES', {}).get(view_name)
+        if rate is None:
+            return None
+        scope, ident = client_ident(request)
+        wait = take_token(f'throttle:{view_name}:{scope}:{ident}', rate)
+        if not wait:
+            return None
+        inc('blogicum_throttled_requests_total', view=view_name, scope=scope)
+        response = import_string(settings.THROTTLE_VIEW)(request)
+        response['Retry-After'] = str(ceil(wait))
+        return response
@@ -1,3 +1,13 @@
-# from django.shortcuts import render
+from django.conf import settings
+from django.http import Http404, HttpResponse
 
-# Create your views here.
+from .metrics import render_text
+
+
+def metrics(request):
+    """Метрики всех воркеров в текстовом формате Prometheus."""
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    return HttpResponse(
+        render_text(), content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -0,0 +1,78 @@
+"""Прогрев воркера до первого запроса.
+
+Вызывается из blogicum/wsgi.py и blogicum/asgi.py после создания
+приложения. Компилирует шаблоны проекта в кеширующий загрузчик,
+заполняет URL-резолвер и проверяет подключения к БД. При запуске
+сервера с предзагрузкой приложения (gunicorn --preload) всё это
+делается один раз в мастер-процессе и достаётся воркерам после fork
+через copy-on-write; подключения к БД перед fork закрываются, чтобы
+воркеры не делили один сокет или файл.
+"""
+import gc
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.urls import URLResolver, get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def template_names():
+    """Имена всех шаблонов из TEMPLATES['DIRS']."""
+    for directory in settings.TEMPLATES[0]['DIRS']:
+        directory = Path(directory)
+        for path in sorted(directory.rglob('*.html')):
+            yield path.relative_to(directory).as_posix()
+
+
+def compile_templates():
+    engine = engines['django'].engine
+    compiled = 0
+    for name in template_names():
+        try:
+            engine.get_template(name)
+        except TemplateSyntaxError as error:
+            logger.warning('Шаблон %s не скомпилирован: %s', name, error)
+        else:
+            compiled += 1
+    return compiled
+
+
+def populate_resolver(resolver=None):
+    """Заполняет словари резолвера и компилирует регулярные выражения."""
+    resolver = resolver or get_resolver()
+    resolver.reverse_dict
+    patterns = 0
+    for pattern in resolver.url_patterns:
+        pattern.pattern.regex
+        if isinstance(pattern, URLResolver):
+            patterns += populate_resolver(pattern)
+        else:
+            patterns += 1
+    return patterns
+
+
+def check_connections():
+    for connection in connections.all():
+        connection.ensure_connection()
+    connections.close_all()
+
+
+def warm_up():
+    if not getattr(settings, 'WARMUP_ON_STARTUP', False):
+        return
+    started = time.perf_counter()
+    templates = compile_templates()
+    patterns = populate_resolver()
+    check_connections()
+    # Объекты, созданные до fork, не трогает сборщик мусора, иначе он
+    # копирует общие страницы памяти в каждый воркер.
+    gc.freeze()
+    logger.info(
+        'Прогрев: %s шаблонов, %s URL-шаблонов за %.1f мс',
+        templates, patterns, (time.perf_counter() - started) * 1000,
+    )
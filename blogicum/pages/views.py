@@ -23,3 +23,8 @@ def page_not_found(request, exception):
 def server_error(request):
     """Отображает кастомную страницу ошибки 500"""
     return render(request, 'pages/500.html', status=500)
+
+
+def too_many_requests(request):
+    """Отображает кастомную страницу ошибки 429"""
+    return render(request, 'pages/429.html', status=429)
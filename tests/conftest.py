@@ -26,6 +26,7 @@ from django.test import override_settings
 from django.test.client import Client
 from mixer.backend.django import mixer as _mixer
 from django.conf import settings
+from django.core.cache import cache, caches
 
 N_PER_FIXTURE = 3
 N_PER_PAGE = 10
@@ -42,6 +43,33 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache():
+    with override_settings(CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+        "feeds": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "feeds",
+        },
+    }):
+        # Хранилище LocMemCache общее для процесса: чистим между тестами.
+        cache.clear()
+        caches["feeds"].clear()
+        yield
+
+
+@pytest.fixture(autouse=True)
+def isolated_storage(tmp_path):
+    with override_settings(
+        PROFILER_SAMPLE_RATE=0,
+        METRICS_DIR=tmp_path / "metrics",
+        SITEMAP_DIR=tmp_path / "sitemaps",
+    ):
+        yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -0,0 +1,96 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _changelist_queries(admin_client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = admin_client.get(url)
+    assert response.status_code == 200
+    return response, len(ctx.captured_queries)
+
+
+@pytest.mark.parametrize("model", ["post", "comment"])
+def test_changelist_queries_do_not_grow(
+    admin_client, mixer, user, post_with_published_location, model
+):
+    url = f"/admin/blog/{model}/"
+    mixer.cycle(3).blend("blog.Comment", post=post_with_published_location)
+    admin_client.get(url)
+    _, few = _changelist_queries(admin_client, url)
+    mixer.cycle(10).blend(
+        "blog.Post", author=user,
+        category=post_with_published_location.category,
+        location=post_with_published_location.location,
+    )
+    mixer.cycle(10).blend("blog.Comment", post=post_with_published_location)
+    _, many = _changelist_queries(admin_client, url)
+    assert many == few, (
+        "Убедитесь, что число запросов списка в админке не зависит от"
+        " числа строк."
+    )
+
+
+def test_bulk_publish_actions(admin_client, mixer, user, published_category):
+    posts = mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+    ids = [post.pk for post in posts]
+    admin_client.post("/admin/blog/post/", {
+        "action": "unpublish", "_selected_action": ids,
+    })
+    model = type(posts[0])
+    assert not model.objects.filter(pk__in=ids, is_published=True).exists(), (
+        "Убедитесь, что действие снимает выбранные публикации."
+    )
+    admin_client.post("/admin/blog/post/", {
+        "action": "publish", "_selected_action": ids,
+    })
+    assert model.objects.filter(pk__in=ids, is_published=True).count() == 3
+
+
+def test_post_search(admin_client, mixer, user, published_category):
+    mixer.blend("blog.Post", title="Поиск по началу", author=user,
+                category=published_category)
+    mixer.blend("blog.Post", title="Другое", author=user,
+                category=published_category)
+    response = admin_client.get("/admin/blog/post/", {"q": "Поиск"})
+    assert response.context["cl"].result_count == 1
+    response = admin_client.get("/admin/blog/post/", {"q": user.username})
+    assert response.context["cl"].result_count == 2, (
+        "Убедитесь, что публикации ищутся по точному имени автора."
+    )
+
+
+def test_comment_changelist_keyset_navigation(
+    admin_client, mixer, post_with_published_location, monkeypatch
+):
+    from blog.admin import CommentAdmin
+
+    monkeypatch.setattr(CommentAdmin, "list_per_page", 10)
+    monkeypatch.setattr(CommentAdmin, "count_limit", 20)
+    comments = mixer.cycle(25).blend(
+        "blog.Comment", post=post_with_published_location
+    )
+    newest = sorted((comment.pk for comment in comments), reverse=True)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = admin_client.get("/admin/blog/comment/")
+    cl = response.context["cl"]
+    assert [comment.pk for comment in cl.result_list] == newest[:10]
+    sql = " ".join(q["sql"] for q in ctx.captured_queries)
+    assert "OFFSET" not in sql, (
+        "Убедитесь, что список комментариев листается без OFFSET."
+    )
+    assert cl.result_count_capped and "Более 20" in response.content.decode()
+
+    response = admin_client.get("/admin/blog/comment/" + cl.next_url)
+    cl = response.context["cl"]
+    assert [comment.pk for comment in cl.result_list] == newest[10:20]
+    response = admin_client.get("/admin/blog/comment/" + cl.previous_url)
+    assert [
+        comment.pk for comment in response.context["cl"].result_list
+    ] == newest[:10], "Убедитесь, что ссылка назад ведёт на новые записи."
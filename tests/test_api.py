@@ -0,0 +1,113 @@
+import base64
+import json
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def api_posts(mixer, user, published_category, published_location):
+    now = timezone.now()
+    return [
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            location=published_location, is_published=True,
+            pub_date=now - timedelta(hours=index),
+        )
+        for index in range(5)
+    ]
+
+
+def test_post_list_cursor_pagination(client, api_posts, mixer, user):
+    mixer.blend(
+        "blog.Post", author=user, is_published=False,
+        category=api_posts[0].category,
+    )
+    seen = []
+    url = "/api/v1/posts/?limit=2&fields=id,title"
+    while url:
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url)
+        assert response.status_code == 200
+        assert "OFFSET" not in " ".join(q["sql"] for q in ctx.captured_queries)
+        data = response.json()
+        seen += [item["id"] for item in data["results"]]
+        assert all(set(item) == {"id", "title"} for item in data["results"])
+        url = data["next"]
+    assert seen == [post.id for post in api_posts], (
+        "Убедитесь, что курсор проходит все опубликованные посты по одному"
+        " разу в порядке убывания даты."
+    )
+
+
+def test_post_list_rejects_malformed_cursor(client, api_posts):
+    for items in ([{}, {}], [1, 2]):
+        cursor = base64.urlsafe_b64encode(json.dumps(items).encode()).decode()
+        response = client.get("/api/v1/posts/", {"cursor": cursor})
+        assert response.status_code == 400, (
+            "Убедитесь, что курсор с нестроковыми значениями даёт 400,"
+            " а не ошибку сервера."
+        )
+
+
+def test_sparse_fields_limit_columns(client, api_posts):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/api/v1/posts/?fields=id,author")
+    item = response.json()["results"][0]
+    assert item == {
+        "id": api_posts[0].id, "author": api_posts[0].author.username
+    }
+    sql = ctx.captured_queries[-1]["sql"]
+    assert '"blog_post"."text"' not in sql, (
+        "Убедитесь, что fields= ограничивает читаемые колонки."
+    )
+    assert '"auth_user"."username"' in sql
+    assert client.get("/api/v1/posts/?fields=secret").status_code == 400
+
+
+def test_post_detail_visibility_and_comments(client, api_posts, mixer, user):
+    post = api_posts[0]
+    mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    data = client.get(f"/api/v1/posts/{post.id}/").json()
+    assert data["location"] == post.location.name
+    comments = client.get(f"/api/v1/posts/{post.id}/comments/?limit=2").json()
+    assert len(comments["results"]) == 2 and comments["next"]
+    rest = client.get(comments["next"]).json()
+    assert len(rest["results"]) == 1 and rest["next"] is None
+
+    post.is_published = False
+    post.save()
+    response = client.get(f"/api/v1/posts/{post.id}/")
+    assert response.status_code == 404
+    assert response.json()["error"]
+
+
+def test_categories_and_locations(client, published_category, mixer):
+    hidden = mixer.blend("blog.Category", is_published=False)
+    slugs = [
+        item["slug"] for item in client.get("/api/v1/categories/").json()[
+            "results"
+        ]
+    ]
+    assert published_category.slug in slugs and hidden.slug not in slugs
+    assert client.get(f"/api/v1/categories/{hidden.slug}/").status_code == 404
+    assert client.get("/api/v1/locations/").status_code == 200
+
+
+def test_conditional_get(client, api_posts):
+    response = client.get("/api/v1/posts/")
+    etag = response["ETag"]
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/api/v1/posts/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert not ctx.captured_queries, (
+        "Убедитесь, что ответ 304 отдаётся без запросов к БД."
+    )
+    api_posts[0].save()
+    response = client.get("/api/v1/posts/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
@@ -0,0 +1,128 @@
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _call(view_class, request, **kwargs):
+    assert view_class.view_is_async, (
+        f"Убедитесь, что `{view_class.__name__}` - асинхронное представление."
+    )
+    return async_to_sync(view_class.as_view())(request, **kwargs)
+
+
+@pytest.fixture
+def visible_post(mixer, user, published_category, published_location):
+    return mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location, is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+@pytest.fixture
+def hidden_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False, pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def test_async_feeds(rf, user, visible_post, hidden_post):
+    from blog.async_views import (
+        AsyncCategoryView, AsyncPostListView, AsyncProfileView
+    )
+
+    request = rf.get("/")
+    request.user = AnonymousUser()
+    for view_class, kwargs in (
+        (AsyncPostListView, {}),
+        (AsyncCategoryView,
+         {"category_slug": visible_post.category.slug}),
+        (AsyncProfileView, {"username": user.username}),
+    ):
+        content = _call(view_class, request, **kwargs).content.decode()
+        assert visible_post.title in content, (
+            f"Убедитесь, что `{view_class.__name__}` показывает"
+            " опубликованные посты."
+        )
+        assert hidden_post.title not in content, (
+            f"Убедитесь, что `{view_class.__name__}` не показывает"
+            " снятые с публикации посты."
+        )
+
+    request.user = user
+    content = _call(
+        AsyncProfileView, request, username=user.username
+    ).content.decode()
+    assert hidden_post.title in content, (
+        "Убедитесь, что автор видит свои неопубликованные посты на"
+        " странице профиля."
+    )
+
+
+def test_async_post_detail(rf, user, another_user, hidden_post):
+    from blog.async_views import AsyncPostDetailView
+
+    request = rf.get("/")
+    request.user = user
+    response = _call(AsyncPostDetailView, request, pk=hidden_post.pk)
+    assert hidden_post.title in response.content.decode()
+
+    request.user = another_user
+    with pytest.raises(Http404):
+        _call(AsyncPostDetailView, request, pk=hidden_post.pk)
+
+
+@pytest.fixture
+def async_urls():
+    import importlib
+
+    from django.test import override_settings
+    from django.urls import clear_url_caches
+
+    import blog.urls
+    import blogicum.urls
+
+    def reload():
+        importlib.reload(blog.urls)
+        importlib.reload(blogicum.urls)
+        clear_url_caches()
+
+    with override_settings(BLOG_ASYNC_VIEWS=True):
+        reload()
+        yield
+    reload()
+
+
+def test_async_views_answer_not_modified(
+    async_urls, async_client, client, user, visible_post
+):
+    from django.urls import resolve
+
+    assert resolve("/").func.view_class.view_is_async
+    for url in (
+        "/",
+        f"/category/{visible_post.category.slug}/",
+        f"/profile/{user.username}/",
+        f"/posts/{visible_post.pk}/",
+    ):
+        response = async_to_sync(async_client.get)(url)
+        assert response.status_code == 200
+        assert response.has_header("ETag"), (
+            f"Убедитесь, что асинхронное представление {url} отдаёт ETag."
+        )
+        response = async_to_sync(async_client.get)(
+            url, headers={"If-None-Match": response["ETag"]}
+        )
+        assert response.status_code == 304, (
+            f"Убедитесь, что асинхронное представление {url} отвечает 304"
+            " на совпадающий If-None-Match."
+        )
+    # Страница ленты попала в кеш: синхронная версия отдаёт её же.
+    assert visible_post.title in client.get("/").content.decode()
@@ -0,0 +1,48 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _user_queries(client, url="/pages/about/"):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    return response, [
+        q["sql"] for q in ctx.captured_queries if '"auth_user"' in q["sql"]
+    ]
+
+
+def test_user_loaded_from_cache(user_client, user):
+    _user_queries(user_client)
+    response, queries = _user_queries(user_client)
+    assert response.context["user"] == user
+    assert not queries, (
+        "Убедитесь, что пользователь авторизованного запроса берётся из"
+        " кеша без запроса к таблице пользователей."
+    )
+
+
+def test_profile_edit_invalidates_cache(user_client, user):
+    _user_queries(user_client)
+    user_client.post("/accounts/profile/", {
+        "username": "renamed_user",
+        "first_name": "Имя",
+        "last_name": "Фамилия",
+        "email": "renamed@example.com",
+    })
+    response, _ = _user_queries(user_client)
+    assert response.context["user"].username == "renamed_user", (
+        "Убедитесь, что после редактирования профиля кеш пользователя"
+        " сбрасывается."
+    )
+
+
+def test_password_change_logs_out_other_sessions(user_client, user):
+    _user_queries(user_client)
+    user.set_password("new-password-123")
+    user.save()
+    response, _ = _user_queries(user_client)
+    assert not response.context["user"].is_authenticated, (
+        "Убедитесь, что после смены пароля старые сессии не принимаются."
+    )
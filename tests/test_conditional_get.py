@@ -0,0 +1,85 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def _revalidate(client, url, response):
+    with CaptureQueriesContext(connection) as ctx:
+        repeated = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    return repeated, len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_post_detail_not_modified(client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.pk}/"
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.has_header("ETag") and response.has_header(
+        "Last-Modified"
+    ), "Убедитесь, что страница поста отдаёт ETag и Last-Modified."
+    repeated, queries = _revalidate(client, url, response)
+    assert repeated.status_code == 304, (
+        "Убедитесь, что страница поста без изменений отвечает 304."
+    )
+    assert queries <= 1, (
+        "Убедитесь, что ответ 304 для поста требует не больше одного"
+        " запроса к БД."
+    )
+
+
+@pytest.mark.django_db
+def test_post_detail_etag_changes_on_comment(
+    user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.pk}/"
+    response = user_client.get(url)
+    user_client.post(
+        f"/posts/{post_with_published_location.pk}/comment/",
+        {"text": "Новый комментарий"},
+    )
+    repeated, _ = _revalidate(user_client, url, response)
+    assert repeated.status_code == 200, (
+        "Убедитесь, что новый комментарий меняет ETag страницы поста."
+    )
+
+
+@pytest.mark.django_db
+def test_post_detail_etag_depends_on_user(
+    client, user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.pk}/"
+    response = client.get(url)
+    repeated, _ = _revalidate(user_client, url, response)
+    assert repeated.status_code == 200, (
+        "Убедитесь, что ETag страницы поста учитывает пользователя."
+    )
+
+
+@pytest.mark.django_db
+def test_hidden_post_not_revalidated(client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.pk}/"
+    response = client.get(url)
+    post_with_published_location.is_published = False
+    post_with_published_location.save()
+    repeated, _ = _revalidate(client, url, response)
+    assert repeated.status_code == 404
+
+
+@pytest.mark.django_db
+def test_feed_not_modified_until_change(client, post_with_published_location):
+    category = post_with_published_location.category
+    author = post_with_published_location.author
+    for url in ("/", f"/category/{category.slug}/", f"/profile/{author}/"):
+        response = client.get(url)
+        repeated, queries = _revalidate(client, url, response)
+        assert repeated.status_code == 304 and queries == 0, (
+            f"Убедитесь, что страница {url} без изменений отвечает 304"
+            " без запросов к БД."
+        )
+    response = client.get("/")
+    post_with_published_location.title = "Обновлённый заголовок"
+    post_with_published_location.save()
+    repeated, _ = _revalidate(client, "/", response)
+    assert repeated.status_code == 200, (
+        "Убедитесь, что изменение поста меняет ETag лент."
+    )
@@ -0,0 +1,76 @@
+import csv
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.http import StreamingHttpResponse
+
+from blog.models import Comment
+from core.export import export_chunks
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_admin_export_csv_streams(
+    admin_client, mixer, user, published_category
+):
+    posts = mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        text="строка\nс переносом",
+    )
+    response = admin_client.post("/admin/blog/post/", {
+        "action": "export_csv",
+        "_selected_action": [post.pk for post in posts[:2]],
+    })
+    assert isinstance(response, StreamingHttpResponse), (
+        "Убедитесь, что выгрузка отдаётся через StreamingHttpResponse."
+    )
+    assert "attachment" in response["Content-Disposition"]
+    content = b"".join(response.streaming_content).decode()
+    rows = list(csv.reader(StringIO(content)))
+    assert rows[0][:2] == ["id", "title"]
+    assert len(rows) == 3
+    assert rows[1][2] == "строка\nс переносом"
+
+
+def test_export_command_jsonl(mixer, post_with_published_location):
+    mixer.cycle(2).blend(
+        "blog.Comment", post=post_with_published_location
+    )
+    out = StringIO()
+    call_command("export", "comments", "--format", "jsonl", stdout=out)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert len(records) == 2
+    assert records[0]["post_id"] == post_with_published_location.pk
+    assert "author__username" in records[0]
+
+
+def test_export_chunks_are_bounded(mixer, post_with_published_location):
+    mixer.cycle(5).blend(
+        "blog.Comment", post=post_with_published_location
+    )
+    chunks = list(export_chunks(
+        Comment.objects.order_by("pk"), ("id", "text"), "csv", chunk_size=2
+    ))
+    assert chunks[0] == "id,text\r\n", (
+        "Убедитесь, что заголовок CSV отдаётся первым куском."
+    )
+    assert len(chunks) == 4
+
+
+def test_export_csv_neutralizes_formulas(mixer, post_with_published_location):
+    for text in ("=HYPERLINK(\"http://evil\")", "+1", "-1", "@SUM(A1)", "ok"):
+        mixer.blend(
+            "blog.Comment", post=post_with_published_location, text=text
+        )
+    content = "".join(export_chunks(
+        Comment.objects.order_by("pk"), ("text",), "csv"
+    ))
+    texts = [row[0] for row in csv.reader(StringIO(content))][1:]
+    assert texts == [
+        "'=HYPERLINK(\"http://evil\")", "'+1", "'-1", "'@SUM(A1)", "ok"
+    ], (
+        "Убедитесь, что значения CSV, похожие на формулы, выгружаются"
+        " с апострофом в начале."
+    )
@@ -0,0 +1,80 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def _query_count(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    return response, len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_anonymous_feed_served_from_cache(
+    client, many_posts_with_published_locations
+):
+    first, cold_queries = _query_count(client, "/")
+    second, warm_queries = _query_count(client, "/")
+    assert second.content == first.content
+    assert warm_queries < cold_queries, (
+        "Убедитесь, что повторный запрос главной страницы анонимным"
+        " пользователем отдаётся из кеша."
+    )
+
+
+@pytest.mark.django_db
+def test_feed_cache_invalidated_on_post_change(
+    client, post_with_published_location
+):
+    client.get("/")
+    post_with_published_location.title = "Обновлённый заголовок"
+    post_with_published_location.save()
+    response = client.get("/")
+    assert "Обновлённый заголовок" in response.content.decode(), (
+        "Убедитесь, что изменение поста сбрасывает кеш лент."
+    )
+
+
+@pytest.mark.django_db
+def test_feed_cache_key_ignores_unknown_params(
+    client, post_with_published_location
+):
+    from django.core.cache import cache, caches
+
+    _, cold_queries = _query_count(client, "/")
+    _, queries = _query_count(client, "/?utm=1")
+    assert queries < cold_queries, (
+        "Убедитесь, что посторонние параметры запроса не входят в ключ"
+        " кеша лент."
+    )
+    _, queries = _query_count(client, "/?page=1")
+    assert queries == cold_queries, (
+        "Убедитесь, что номер страницы входит в ключ кеша лент."
+    )
+    cache.clear()
+    assert _query_count(client, "/?utm=2")[1] < cold_queries, (
+        "Убедитесь, что страницы лент хранятся в кеше FEED_CACHE,"
+        " отдельно от сессий."
+    )
+    assert caches["feeds"] is not cache
+
+
+@pytest.mark.django_db(transaction=True)
+def test_warm_cache_command(client, post_with_published_location):
+    out = StringIO()
+    call_command("warm_cache", "--workers", "2", stdout=out)
+    output = out.getvalue()
+    category = post_with_published_location.category
+    author = post_with_published_location.author
+    for url in ("/", f"/category/{category.slug}/", f"/profile/{author}/"):
+        assert f"200 {url} " in output, (
+            f"Убедитесь, что команда warm_cache прогревает страницу {url}."
+        )
+    _, queries = _query_count(client, "/")
+    assert queries == 0, (
+        "Убедитесь, что после warm_cache главная страница отдаётся из кеша."
+    )
@@ -0,0 +1,76 @@
+import base64
+import json
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def location_posts(mixer, user, published_category, published_location):
+    now = timezone.now()
+    return [
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            location=published_location, is_published=True,
+            pub_date=now - timedelta(hours=index),
+        )
+        for index in range(12)
+    ]
+
+
+def test_location_feed_cursor_pages(
+    client, mixer, published_location, location_posts
+):
+    mixer.blend(
+        "blog.Post", location=published_location, is_published=False,
+        category=location_posts[0].category,
+    )
+    url = f"/location/{published_location.pk}/"
+    first = client.get(url)
+    assert first.status_code == 200
+    second = client.get(url, {"cursor": first.context["next_cursor"]})
+    seen = [
+        post.pk for response in (first, second)
+        for post in response.context["object_list"]
+    ]
+    assert seen == [post.pk for post in location_posts], (
+        "Убедитесь, что страница местоположения выводит опубликованные"
+        " посты от новых к старым без пропусков и повторов."
+    )
+    assert second.context["next_cursor"] is None
+
+
+def test_location_feed_cached_for_anonymous(
+    client, published_location, location_posts
+):
+    url = f"/location/{published_location.pk}/"
+    client.get(url)
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    assert not ctx.captured_queries, (
+        "Убедитесь, что страница местоположения кешируется как ленты."
+    )
+
+
+def test_hidden_location_and_bad_cursor(client, mixer, published_location):
+    hidden = mixer.blend("blog.Location", is_published=False)
+    assert client.get(f"/location/{hidden.pk}/").status_code == 404
+    response = client.get(
+        f"/location/{published_location.pk}/", {"cursor": "bad"}
+    )
+    assert response.status_code == 404
+    for items in ([{}, {}], [1, 2]):
+        cursor = base64.urlsafe_b64encode(json.dumps(items).encode()).decode()
+        response = client.get(
+            f"/location/{published_location.pk}/", {"cursor": cursor}
+        )
+        assert response.status_code == 404, (
+            "Убедитесь, что курсор с нестроковыми значениями даёт 404,"
+            " а не ошибку сервера."
+        )
@@ -0,0 +1,104 @@
+import json
+import re
+
+import pytest
+from django.conf import settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _value(text, line_start):
+    for line in text.splitlines():
+        if line.startswith(line_start):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(
+        f"Убедитесь, что /metrics содержит метрику `{line_start}`."
+    )
+
+
+def test_metrics_per_view(client):
+    client.get("/")
+    client.get("/pages/about/")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    text = response.content.decode()
+    assert _value(
+        text, 'blogicum_http_responses_total{status="200",view="blog:index"}'
+    ) >= 1
+    assert _value(
+        text,
+        "blogicum_http_request_duration_seconds_count"
+        '{method="GET",view="pages:about"}',
+    ) >= 1
+    assert _value(text, 'blogicum_db_queries_total{view="blog:index"}') >= 1
+    assert _value(
+        text,
+        'blogicum_template_render_duration_seconds_count{view="blog:index"}',
+    ) >= 1
+
+
+def test_metrics_aggregate_worker_files(client):
+    client.get("/pages/rules/")
+    before = _value(
+        client.get("/metrics").content.decode(),
+        'blogicum_http_responses_total{status="200",view="pages:rules"}',
+    )
+    metrics_dir = settings.METRICS_DIR
+    (metrics_dir / "999999.json").write_text(json.dumps({
+        "counters": [[
+            "blogicum_http_responses_total",
+            {"view": "pages:rules", "status": 200},
+            5,
+        ]],
+        "histograms": [],
+    }))
+    after = _value(
+        client.get("/metrics").content.decode(),
+        'blogicum_http_responses_total{status="200",view="pages:rules"}',
+    )
+    assert after == before + 5, (
+        "Убедитесь, что /metrics суммирует метрики всех воркеров."
+    )
+
+
+def test_metrics_hidden_from_other_hosts(client):
+    response = client.get("/metrics", REMOTE_ADDR="10.0.0.1")
+    assert response.status_code == 404
+    assert not re.search("blogicum_", response.content.decode())
+
+
+def test_metrics_middleware_under_asgi(async_client, client):
+    from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+    from django.contrib.auth import get_user_model
+    from django.core.cache import caches
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+
+    from core.metrics import MetricsMiddleware
+
+    async def get_response(request):
+        # Запрос к БД выполняется не в потоке цикла событий.
+        await sync_to_async(get_user_model().objects.count)()
+        return HttpResponse()
+
+    middleware = MetricsMiddleware(get_response)
+    assert iscoroutinefunction(middleware), (
+        "Убедитесь, что `MetricsMiddleware` работает в асинхронной цепочке"
+        " middleware без переключения в поток."
+    )
+    queries = 'blogicum_db_queries_total{view="unresolved"}'
+    async_to_sync(middleware)(RequestFactory().get("/"))
+    assert _value(client.get("/metrics").content.decode(), queries) >= 1, (
+        "Убедитесь, что под ASGI учитываются SQL-запросы, выполненные"
+        " через sync_to_async."
+    )
+
+    responses = 'blogicum_http_responses_total{status="200",view="blog:index"}'
+    client.get("/")
+    before = _value(client.get("/metrics").content.decode(), responses)
+    # Лента из кеша не делает запросов к БД.
+    caches["feeds"].clear()
+    assert async_to_sync(async_client.get)("/").status_code == 200
+    after = _value(client.get("/metrics").content.decode(), responses)
+    assert after == before + 1
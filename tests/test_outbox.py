@@ -0,0 +1,76 @@
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from core.models import OutboxEmail
+
+LOCMEM = "django.core.mail.backends.locmem.EmailBackend"
+
+
+@pytest.fixture
+def outbox_settings(settings):
+    settings.EMAIL_BACKEND = "core.mail.OutboxBackend"
+    settings.OUTBOX_DELIVERY_BACKEND = LOCMEM
+    settings.OUTBOX_MAX_ATTEMPTS = 3
+    settings.OUTBOX_RETRY_DELAY = 60
+    return settings
+
+
+@pytest.mark.django_db
+def test_password_reset_only_queues_email(outbox_settings, client, user):
+    user.email = "reader@example.com"
+    user.save()
+    response = client.post(
+        "/auth/password_reset/", {"email": "reader@example.com"}
+    )
+    assert response.status_code == 302
+    assert not mail.outbox, (
+        "Убедитесь, что письмо сброса пароля не отправляется в запросе."
+    )
+    email = OutboxEmail.objects.get()
+    assert email.to == ["reader@example.com"]
+    assert email.status == OutboxEmail.PENDING
+
+
+@pytest.mark.django_db
+def test_send_outbox_delivers_batch(outbox_settings):
+    for number in range(3):
+        mail.send_mail(
+            f"Тема {number}", "Текст", "blog@example.com",
+            ["reader@example.com"], html_message="<p>Текст</p>",
+        )
+    out = StringIO()
+    call_command("send_outbox", "--batch-size", "2", stdout=out)
+    assert len(mail.outbox) == 3
+    assert mail.outbox[0].alternatives == [("<p>Текст</p>", "text/html")]
+    assert not OutboxEmail.objects.exclude(status=OutboxEmail.SENT).exists()
+    assert "отправлено 3" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_failed_delivery_retried_with_backoff(outbox_settings, monkeypatch):
+    def broken(self, messages):
+        raise ConnectionError("сервер недоступен")
+
+    monkeypatch.setattr(EmailBackend, "send_messages", broken)
+    mail.send_mail("Тема", "Текст", "blog@example.com", ["a@example.com"])
+    email = OutboxEmail.objects.get()
+    delays = []
+    for _ in range(3):
+        OutboxEmail.objects.filter(pk=email.pk).update(
+            next_attempt_at=timezone.now()
+        )
+        started = timezone.now()
+        call_command("send_outbox", stdout=StringIO())
+        email.refresh_from_db()
+        delays.append((email.next_attempt_at - started).total_seconds())
+    assert delays[1] >= 2 * 60 - 1, (
+        "Убедитесь, что задержка перед повтором растёт с каждой попыткой."
+    )
+    assert email.status == OutboxEmail.FAILED
+    assert email.attempts == 3
+    assert "сервер недоступен" in email.last_error
@@ -0,0 +1,94 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _selects(client, method, url, table, data=None):
+    with CaptureQueriesContext(connection) as ctx:
+        response = getattr(client, method)(url, data)
+    return response, [
+        q["sql"] for q in ctx.captured_queries
+        if q["sql"].startswith("SELECT") and f'FROM "{table}"' in q["sql"]
+    ]
+
+
+@pytest.fixture
+def own_comment(mixer, user, post_with_published_location):
+    return mixer.blend(
+        "blog.Comment", author=user, post=post_with_published_location
+    )
+
+
+@pytest.mark.parametrize("action", ["edit", "delete"])
+def test_post_loaded_once(user_client, post_with_published_location, action):
+    post = post_with_published_location
+    response, selects = _selects(
+        user_client, "get", f"/posts/{post.id}/{action}/", "blog_post"
+    )
+    assert response.status_code == 200
+    assert len(selects) == 1, (
+        "Убедитесь, что пост загружается одним запросом и для проверки"
+        " авторства, и для обработчика."
+    )
+
+
+def test_post_delete_scoped_to_author(
+    user_client, post_with_published_location
+):
+    post = post_with_published_location
+    response, selects = _selects(
+        user_client, "post", f"/posts/{post.id}/delete/", "blog_post"
+    )
+    assert response.status_code == 302
+    assert all('"author_id" =' in sql for sql in selects), (
+        "Убедитесь, что удаление поста ограничено автором в самом запросе."
+    )
+    assert not type(post).objects.filter(pk=post.pk).exists()
+
+
+def test_not_author_cannot_delete(
+    another_user_client, post_with_published_location, own_comment
+):
+    post = post_with_published_location
+    response = another_user_client.post(f"/posts/{post.id}/delete/")
+    assert response.status_code == 302
+    assert response.url == f"/posts/{post.id}/"
+    response = another_user_client.post(
+        f"/posts/{post.id}/delete_comment/{own_comment.id}/"
+    )
+    assert response.status_code == 302
+    assert type(post).objects.filter(pk=post.pk).exists()
+    assert type(own_comment).objects.filter(pk=own_comment.pk).exists(), (
+        "Убедитесь, что чужой комментарий не удаляется."
+    )
+    response = another_user_client.post("/posts/999999/delete/")
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("action", ["edit_comment", "delete_comment"])
+def test_comment_loaded_once(user_client, own_comment, action):
+    url = f"/posts/{own_comment.post_id}/{action}/{own_comment.id}/"
+    response, selects = _selects(user_client, "get", url, "blog_comment")
+    assert response.status_code == 200
+    assert len(selects) == 1, (
+        "Убедитесь, что комментарий загружается одним запросом."
+    )
+    response, selects = _selects(
+        user_client, "post", url, "blog_comment", {"text": "Новый текст"}
+    )
+    assert response.status_code == 302
+    assert len(selects) == 1
+
+
+def test_not_author_redirected(
+    another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    response, selects = _selects(
+        another_user_client, "get", f"/posts/{post.id}/edit/", "blog_post"
+    )
+    assert response.status_code == 302
+    assert response.url == f"/posts/{post.id}/"
+    assert len(selects) == 2
@@ -0,0 +1,81 @@
+import time
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import RequestFactory, override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_stack_sampler_collects_stacks():
+    import threading
+
+    from core.profiling import StackSampler
+
+    sampler = StackSampler(threading.get_ident(), 0.001)
+    sampler.start()
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        pass
+    sampler.stop()
+    assert sampler.stacks, "Убедитесь, что StackSampler снимает стеки."
+    assert any(
+        "test_stack_sampler_collects_stacks" in stack
+        for stack in sampler.stacks
+    )
+
+
+@override_settings(PROFILER_SAMPLE_RATE=0, PROFILER_HEADER="X-Profile")
+def test_signed_header_enables_profiling(tmp_path):
+    from core.profiling import SamplingProfilerMiddleware, make_profile_token
+
+    with override_settings(PROFILER_DIR=tmp_path):
+        middleware = SamplingProfilerMiddleware(lambda request: None)
+    factory = RequestFactory()
+    assert middleware.should_profile(
+        factory.get("/", HTTP_X_PROFILE=make_profile_token())
+    ), "Убедитесь, что запрос с подписанным заголовком профилируется."
+    assert not middleware.should_profile(
+        factory.get("/", HTTP_X_PROFILE="forged")
+    ), "Убедитесь, что запрос с поддельным заголовком не профилируется."
+    assert not middleware.should_profile(factory.get("/"))
+
+
+def test_profile_report_aggregates_samples(tmp_path):
+    (tmp_path / "blog_index.1.1.folded").write_text(
+        "main;view;render 3\nmain;view;query 1\n", encoding="utf-8"
+    )
+    (tmp_path / "blog_post_detail.2.1.folded").write_text(
+        "main;view;query 4\n", encoding="utf-8"
+    )
+    out = StringIO()
+    with override_settings(PROFILER_DIR=tmp_path):
+        call_command("profile_report", stdout=out)
+    lines = out.getvalue().splitlines()
+    assert "выборок: 8" in lines[0]
+    assert lines[2].split() == ["62.5", "62.5", "query"], (
+        "Убедитесь, что самой горячей функцией считается функция с"
+        " наибольшим числом собственных выборок."
+    )
+
+
+@override_settings(PROFILER_SAMPLE_RATE=1)
+def test_async_views_are_not_profiled(tmp_path):
+    from django.http import HttpResponse
+
+    from core.profiling import SamplingProfilerMiddleware
+
+    async def view(request):
+        return HttpResponse()
+
+    with override_settings(PROFILER_DIR=tmp_path):
+        middleware = SamplingProfilerMiddleware(view)
+    request = RequestFactory().get("/")
+    middleware.process_request(request)
+    assert request._stack_sampler is not None
+    middleware.process_view(request, view, (), {})
+    assert request._stack_sampler is None, (
+        "Убедитесь, что асинхронные view не профилируются: их стек"
+        " снимается не в том потоке."
+    )
@@ -0,0 +1,102 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import RelatedPost
+
+pytestmark = [pytest.mark.django_db]
+
+TEXTS = (
+    ("Горные лыжи", "Катались на горных лыжах, снег и склоны отличные."),
+    ("Снова лыжи", "Горные склоны, свежий снег, лыжи и подъёмники."),
+    ("Борщ", "Варили борщ со свёклой и капустой по бабушкиному рецепту."),
+    ("Щи", "Снова свёклой и капустой: рецепту щей много лет."),
+    ("Заметки", "Разное о погоде."),
+)
+
+
+@pytest.fixture
+def text_posts(mixer, user, published_category):
+    return [
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            location=None, is_published=True, title=title, text=text,
+            pub_date=timezone.now(),
+        )
+        for title, text in TEXTS
+    ]
+
+
+def _related():
+    return {
+        (row.post_id, row.rank): row.related_id
+        for row in RelatedPost.objects.all()
+    }
+
+
+def _scores():
+    # При равных оценках порядок соседей может отличаться.
+    return {
+        (row.post_id, row.rank): round(row.score, 5)
+        for row in RelatedPost.objects.all()
+    }
+
+
+def test_related_by_shared_vocabulary(text_posts):
+    call_command("compute_related", "--top-k", "1", stdout=StringIO())
+    related = _related()
+    skiing, more_skiing, borscht, shchi, _ = text_posts
+    assert related[skiing.pk, 0] == more_skiing.pk, (
+        "Убедитесь, что похожими считаются посты с общими словами."
+    )
+    assert related[borscht.pk, 0] == shchi.pk
+
+
+def test_chunked_computation_matches(text_posts):
+    call_command("compute_related", stdout=StringIO())
+    whole = _scores()
+    call_command("compute_related", "--chunk-size", "2", stdout=StringIO())
+    assert _scores() == whole, (
+        "Убедитесь, что результат не зависит от размера блока."
+    )
+
+
+def test_detail_shows_related(client, text_posts):
+    call_command("compute_related", "--top-k", "1", stdout=StringIO())
+    response = client.get(f"/posts/{text_posts[0].pk}/")
+    assert [
+        item.related for item in response.context["related_posts"]
+    ] == [text_posts[1]]
+    text_posts[1].is_published = False
+    text_posts[1].save()
+    response = client.get(f"/posts/{text_posts[0].pk}/")
+    assert not response.context["related_posts"], (
+        "Убедитесь, что скрытые посты не показываются среди похожих."
+    )
+
+
+def test_detail_etag_follows_related_posts(client, text_posts):
+    call_command("compute_related", "--top-k", "1", stdout=StringIO())
+    url = f"/posts/{text_posts[0].pk}/"
+    etag = client.get(url)["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    text_posts[1].title = "Новый заголовок"
+    text_posts[1].save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что переименование похожего поста меняет ETag."
+    )
+    assert "Новый заголовок" in response.content.decode()
+
+    etag = response["ETag"]
+    type(text_posts[1]).objects.filter(pk=text_posts[1].pk).update(
+        pub_date=timezone.now() + timedelta(days=1)
+    )
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что скрытие похожего поста меняет ETag."
+    )
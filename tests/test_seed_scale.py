@@ -0,0 +1,73 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _seed(seed):
+    call_command(
+        "seed_scale", users=5, categories=3, locations=4, posts=40,
+        comments=120, seed=seed, batch_size=16, stdout=StringIO(),
+    )
+
+
+def test_seed_scale_fills_tables(PostModel, CommentModel):
+    from blog.models import Category, Location
+
+    _seed(1)
+    assert Category.objects.count() == 3
+    assert Location.objects.count() == 4
+    assert PostModel.objects.count() == 40, (
+        "Убедитесь, что команда `seed_scale` создаёт заданное число постов."
+    )
+    assert CommentModel.objects.count() == 120, (
+        "Убедитесь, что команда `seed_scale` создаёт заданное число"
+        " комментариев."
+    )
+
+
+def test_seed_scale_is_deterministic(PostModel):
+    from blog.models import Category, Location, User
+
+    _seed(7)
+    first = list(PostModel.objects.order_by("pk").values_list(
+        "title", "author__username", "category__slug", "pub_date"
+    ))
+    for model in (PostModel, Category, Location, User):
+        model.objects.all().delete()
+    _seed(7)
+    second = list(PostModel.objects.order_by("pk").values_list(
+        "title", "author__username", "category__slug", "pub_date"
+    ))
+    assert first == second, (
+        "Убедитесь, что команда `seed_scale` с одинаковым зерном генерирует"
+        " одинаковые данные."
+    )
+
+
+def test_seed_scale_dates(PostModel):
+    from datetime import datetime, timedelta
+
+    from django.utils import timezone
+
+    call_command(
+        "seed_scale", users=5, categories=3, locations=4, posts=40,
+        comments=0, seed=3, future_ratio=0.5, stdout=StringIO(),
+    )
+    now = timezone.now()
+    anchor = timezone.make_aware(datetime(2024, 1, 1))
+    dates = list(PostModel.objects.values_list("pub_date", flat=True))
+    future = [pub_date for pub_date in dates if pub_date > now]
+    assert future, (
+        "Убедитесь, что команда `seed_scale` создаёт отложенные посты с"
+        " датой публикации в будущем."
+    )
+    assert all(
+        anchor - timedelta(days=366) <= pub_date <= anchor
+        for pub_date in dates if pub_date <= now
+    ), (
+        "Убедитесь, что даты опубликованных постов отсчитываются от"
+        " постоянной даты `--anchor`, а не от текущего дня."
+    )
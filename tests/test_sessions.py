@@ -0,0 +1,76 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def SessionStore():
+    from core.sessions import SessionStore
+
+    return SessionStore
+
+
+def test_anonymous_session_in_signed_cookie(SessionStore):
+    session = SessionStore()
+    session["cart"] = [1, 2]
+    session.save()
+    assert not Session.objects.exists(), (
+        "Убедитесь, что сессия без пользователя не сохраняется в БД."
+    )
+    assert SessionStore(session.session_key)["cart"] == [1, 2]
+
+
+def test_user_session_survives_cache_loss(user_client, user, SessionStore):
+    session_key = user_client.cookies["sessionid"].value
+    assert Session.objects.filter(pk=session_key).exists()
+    restored = SessionStore(session_key)
+    restored._cache.clear()
+    assert restored["_auth_user_id"] == str(user.pk)
+    assert user_client.get("/").context["user"] == user
+
+
+@override_settings(SESSION_WRITE_BACK_INTERVAL=300)
+def test_write_back_interval(user_client, SessionStore):
+    session_key = user_client.cookies["sessionid"].value
+    session = SessionStore(session_key)
+    session["theme"] = "dark"
+    session.save()
+    assert "theme" not in Session.objects.get(pk=session_key).get_decoded(), (
+        "Убедитесь, что в пределах SESSION_WRITE_BACK_INTERVAL сессия"
+        " обновляется только в кеше."
+    )
+    assert SessionStore(session_key)["theme"] == "dark"
+
+    session = SessionStore(session_key)
+    session["_auth_user_hash"] = "changed"
+    session.save()
+    assert (
+        Session.objects.get(pk=session_key).get_decoded()["_auth_user_hash"]
+        == "changed"
+    ), "Убедитесь, что смена хеша пароля сразу сохраняется в БД."
+
+
+def test_clearsessions_in_batches():
+    expired = timezone.now() - timedelta(days=1)
+    Session.objects.bulk_create(
+        Session(session_key=f"expired{i:04}", session_data="",
+                expire_date=expired)
+        for i in range(25)
+    )
+    Session.objects.create(
+        session_key="alive0000", session_data="",
+        expire_date=timezone.now() + timedelta(days=1),
+    )
+    out = StringIO()
+    call_command("clearsessions", batch_size=10, stdout=out)
+    assert list(Session.objects.values_list("pk", flat=True)) == [
+        "alive0000"
+    ]
+    assert "25" in out.getvalue()
@@ -0,0 +1,105 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _content(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return b"".join(response.streaming_content).decode()
+
+
+def _build(*args):
+    out = StringIO()
+    call_command("build_sitemaps", *args, stdout=out)
+    return out.getvalue()
+
+
+@override_settings(SITEMAP_SHARD_SIZE=2)
+def test_sitemap_shards_and_index(
+    client, mixer, user, published_category, settings
+):
+    posts = mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    hidden = posts[-1]
+    hidden.is_published = False
+    hidden.save()
+    output = _build()
+    assert "полная перестройка" in output
+
+    index = _content(client, "/sitemap.xml")
+    shards = {f"posts-{(post.pk - 1) // 2}" for post in posts[:-1]}
+    for name in shards:
+        assert f"{settings.SITE_URL}/sitemaps/{name}.xml" in index
+
+    content = "".join(
+        _content(client, f"/sitemaps/{name}.xml") for name in shards
+    )
+    for post in posts[:-1]:
+        assert f"{settings.SITE_URL}/posts/{post.pk}/" in content
+    assert f"/posts/{hidden.pk}/" not in content, (
+        "Убедитесь, что в карту сайта попадают только опубликованные посты."
+    )
+    assert content.count("<url>") == 4
+    assert all(
+        _content(client, f"/sitemaps/{name}.xml").count("<url>") <= 2
+        for name in shards
+    ), "Убедитесь, что шард содержит не больше SITEMAP_SHARD_SIZE адресов."
+
+    categories = _content(
+        client, f"/sitemaps/categories-{(published_category.pk - 1) // 2}.xml"
+    )
+    assert f"/category/{published_category.slug}/" in categories
+
+
+@override_settings(SITEMAP_SHARD_SIZE=2)
+def test_only_dirty_shards_rebuilt(mixer, user, published_category):
+    posts = mixer.cycle(6).blend(
+        "blog.Post", author=user, category=published_category,
+    )
+    _build()
+    assert "0 шардов" in _build(), (
+        "Убедитесь, что без изменений шарды не перестраиваются."
+    )
+    posts[0].title = "Изменённый"
+    posts[0].save()
+    output = _build()
+    assert f"posts-{(posts[0].pk - 1) // 2}:" in output
+    assert "1 шардов" in output
+
+
+@override_settings(SITEMAP_SHARD_SIZE=2)
+def test_admin_bulk_unpublish_marks_shards(
+    admin_client, client, mixer, user, published_category
+):
+    posts = mixer.cycle(4).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    _build()
+    hidden = posts[0]
+    admin_client.post("/admin/blog/post/", {
+        "action": "unpublish", "_selected_action": [hidden.pk],
+    })
+    name = f"posts-{(hidden.pk - 1) // 2}"
+    output = _build()
+    assert f"{name}:" in output, (
+        "Убедитесь, что снятие с публикации в админке помечает шард карты"
+        " сайта для перестройки."
+    )
+    assert f"/posts/{hidden.pk}/" not in _content(
+        client, f"/sitemaps/{name}.xml"
+    )
+
+
+def test_unknown_shard_404(client):
+    assert client.get("/sitemaps/secret.xml").status_code == 404
+    assert client.get("/sitemap.xml").status_code == 404
@@ -0,0 +1,94 @@
+import json
+import logging
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def slow_query_records(caplog):
+    logger = logging.getLogger("blogicum.slow_queries")
+    logger.addHandler(caplog.handler)
+    caplog.set_level(logging.WARNING, logger="blogicum.slow_queries")
+    yield lambda: [json.loads(record.message) for record in caplog.records]
+    logger.removeHandler(caplog.handler)
+
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+def test_slow_queries_attributed_to_view(
+    client, post_with_published_location, slow_query_records
+):
+    client.get(f"/posts/{post_with_published_location.id}/")
+    records = [
+        record for record in slow_query_records()
+        if record["view"] == "blog:post_detail"
+    ]
+    assert records, (
+        "Убедитесь, что медленные запросы пишутся в журнал с именем view."
+    )
+    assert any(
+        (record["call_site"] or "").startswith("blog/views.py")
+        for record in records
+    ), "Убедитесь, что в журнале указано место вызова в коде проекта."
+    selects = [r for r in records if r["sql"].startswith("SELECT")]
+    fingerprints = [r["fingerprint"] for r in selects if r["plan"]]
+    assert fingerprints and len(fingerprints) == len(set(fingerprints)), (
+        "Убедитесь, что план выполнения снимается один раз на отпечаток."
+    )
+
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+def test_slow_queries_under_asgi(slow_query_records):
+    from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+    from django.contrib.auth import get_user_model
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+
+    from core.slow_queries import SlowQueryMiddleware
+
+    async def get_response(request):
+        # Запрос к БД выполняется не в потоке цикла событий.
+        await sync_to_async(get_user_model().objects.count)()
+        return HttpResponse()
+
+    middleware = SlowQueryMiddleware(get_response)
+    assert iscoroutinefunction(middleware), (
+        "Убедитесь, что `SlowQueryMiddleware` работает в асинхронной"
+        " цепочке middleware без переключения в поток."
+    )
+    async_to_sync(middleware)(RequestFactory().get("/asgi/"))
+    records = [
+        record for record in slow_query_records()
+        if record["path"] == "/asgi/"
+    ]
+    assert records, (
+        "Убедитесь, что под ASGI в журнал попадают запросы, выполненные"
+        " через sync_to_async."
+    )
+
+
+def test_slowqueries_report(tmp_path):
+    log = tmp_path / "slow.log"
+    lines = [
+        {"fingerprint": "aaa", "duration_ms": 150.0, "sql": "SELECT 1",
+         "view": "blog:index", "call_site": "blog/views.py:10 in get",
+         "plan": ["SCAN blog_post"]},
+        {"fingerprint": "aaa", "duration_ms": 250.0, "sql": "SELECT 1",
+         "view": "blog:index", "call_site": "blog/views.py:10 in get",
+         "plan": None},
+        {"fingerprint": "bbb", "duration_ms": 120.0, "sql": "SELECT 2",
+         "view": "blog:profile", "call_site": None, "plan": None},
+    ]
+    log.write_text("\n".join(json.dumps(line) for line in lines))
+    out = StringIO()
+    call_command("slowqueries", log=str(log), plans=True, stdout=out)
+    report = out.getvalue()
+    assert report.index("aaa: 2 раз") < report.index("bbb: 1 раз"), (
+        "Убедитесь, что отчёт группирует запросы по отпечатку и"
+        " сортирует их по суммарному времени."
+    )
+    assert "SCAN blog_post" in report
@@ -0,0 +1,40 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from core.management.commands.startup_profile import parse_importtime
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     c
+import time:       200 |        300 |   b
+import time:        50 |         50 |   d
+import time:      1000 |       1350 | a
+import time:        10 |         10 | e
+"""
+
+
+def test_parse_importtime():
+    roots = parse_importtime(IMPORTTIME.splitlines())
+    assert [node["name"] for node in roots] == ["a", "e"]
+    a = roots[0]
+    assert a["cumulative"] == 1.35 and a["self"] == 1.0
+    assert [node["name"] for node in a["children"]] == ["b", "d"], (
+        "Убедитесь, что потомки модуля собираются по уровню вложенности."
+    )
+    assert a["children"][0]["children"][0]["name"] == "c"
+
+
+def test_startup_profile_skips_async_views_under_wsgi(monkeypatch):
+    monkeypatch.delenv("BLOGICUM_ASYNC_VIEWS", raising=False)
+    monkeypatch.setenv("BLOGICUM_WARMUP", "0")
+    out = StringIO()
+    call_command("startup_profile", "--min-ms", "0", "--depth", "50",
+                 stdout=out)
+    output = out.getvalue()
+    assert "blogicum.wsgi" in output
+    assert "готов к работе через" in output
+    assert "blog.async_views" not in output, (
+        "Убедитесь, что WSGI-воркер не импортирует асинхронные"
+        " представления."
+    )
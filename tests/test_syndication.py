@@ -0,0 +1,73 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_index_feed_lists_published_posts(
+    client,
+    post_with_published_location,
+    unpublished_posts_with_published_locations,
+):
+    response = client.get("/feed/")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("application/rss+xml")
+    content = response.content.decode()
+    assert post_with_published_location.title in content
+    for post in unpublished_posts_with_published_locations:
+        assert f"/posts/{post.id}/" not in content, (
+            "Убедитесь, что в ленту попадают только опубликованные посты."
+        )
+
+
+@pytest.mark.parametrize("url", [
+    "/feed/atom/", "/category/{slug}/feed/", "/profile/{username}/feed/",
+])
+def test_feeds_conditional_get(client, post_with_published_location, url):
+    url = url.format(
+        slug=post_with_published_location.category.slug,
+        username=post_with_published_location.author.username,
+    )
+    response = client.get(url)
+    assert response.status_code == 200
+    assert post_with_published_location.title in response.content.decode()
+    etag = response["ETag"]
+    assert response["Last-Modified"]
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        "Убедитесь, что лента отвечает 304 на запрос с актуальным ETag."
+    )
+
+    post_with_published_location.title = "Новый заголовок поста"
+    post_with_published_location.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что изменение поста сбрасывает закешированную ленту."
+    )
+    assert "Новый заголовок поста" in response.content.decode()
+
+
+def test_feed_last_modified_follows_edits(
+    client, post_with_published_location
+):
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    post = post_with_published_location
+    type(post).objects.filter(pk=post.pk).update(
+        updated_at=timezone.now() - timedelta(hours=1)
+    )
+    last_modified = client.get("/feed/atom/")["Last-Modified"]
+    post.title = "Исправленный заголовок"
+    post.save()
+    response = client.get("/feed/atom/", HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 200, (
+        "Убедитесь, что правка поста меняет Last-Modified ленты."
+    )
+    assert "Исправленный заголовок" in response.content.decode()
+
+
+def test_unpublished_category_feed_404(client, mixer):
+    category = mixer.blend("blog.Category", is_published=False)
+    assert client.get(f"/category/{category.slug}/feed/").status_code == 404
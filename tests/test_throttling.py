@@ -0,0 +1,65 @@
+import pytest
+from django.test import override_settings
+
+from core.metrics import registry
+from core.throttling import parse_rate, take_token
+
+
+def test_parse_rate():
+    assert parse_rate("10/m") == (10, 60)
+    assert parse_rate("5/hour") == (5, 3600)
+
+
+def test_token_bucket_refills(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("core.throttling.time.time", lambda: now[0])
+    assert take_token("bucket", "2/m") == 0
+    assert take_token("bucket", "2/m") == 0
+    assert take_token("bucket", "2/m") == pytest.approx(30)
+    now[0] += 30
+    assert take_token("bucket", "2/m") == 0, (
+        "Убедитесь, что ведро пополняется равномерно за период."
+    )
+
+
+@pytest.mark.django_db
+@override_settings(THROTTLE_RATES={"login": "2/m"})
+def test_login_throttled_per_ip(client):
+    data = {"username": "nobody", "password": "wrong"}
+    statuses = [client.post("/auth/login/", data).status_code
+                for _ in range(3)]
+    assert statuses == [200, 200, 429], (
+        "Убедитесь, что после исчерпания нормы вход отвечает статусом 429."
+    )
+    response = client.post("/auth/login/", data)
+    assert int(response["Retry-After"]) > 0
+    assert client.get("/auth/login/").status_code == 200, (
+        "Убедитесь, что GET-запросы не ограничиваются."
+    )
+    other = client.post("/auth/login/", data, REMOTE_ADDR="10.0.0.2")
+    assert other.status_code == 200
+
+    counters = {
+        (name, tuple(sorted(labels.items()))): value
+        for name, labels, value in registry.snapshot()["counters"]
+    }
+    key = (
+        "blogicum_throttled_requests_total",
+        (("scope", "ip"), ("view", "login")),
+    )
+    assert counters.get(key, 0) >= 2
+
+
+@pytest.mark.django_db
+@override_settings(THROTTLE_RATES={"blog:add_comment": "1/m"})
+def test_comments_throttled_per_user(
+    user_client, another_user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/comment/"
+    assert user_client.post(url, {"text": "Первый"}).status_code == 302
+    assert user_client.post(url, {"text": "Второй"}).status_code == 429
+    assert another_user_client.post(
+        url, {"text": "Другой"}
+    ).status_code == 302, (
+        "Убедитесь, что норма считается отдельно для каждого пользователя."
+    )
@@ -0,0 +1,122 @@
+import base64
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Follow, TimelineEntry
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def author_posts(mixer, another_user, published_category):
+    now = timezone.now()
+    return [
+        mixer.blend(
+            "blog.Post", author=another_user, category=published_category,
+            is_published=True, pub_date=now - timedelta(hours=index),
+        )
+        for index in range(5)
+    ]
+
+
+def _timeline(client, cursor=None):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(
+            "/timeline/", {"cursor": cursor} if cursor else {}
+        )
+    assert response.status_code == 200
+    ids = [post.pk for post in response.context["posts"]]
+    return ids, response.context["next_cursor"], len(ctx.captured_queries)
+
+
+def _read_all(client):
+    seen, queries, cursor = [], set(), None
+    while True:
+        ids, cursor, count = _timeline(client, cursor)
+        seen += ids
+        queries.add(count)
+        if not cursor:
+            return seen, queries
+
+
+def test_follow_fan_out_and_paginate(
+    settings, user, user_client, another_user, author_posts, mixer
+):
+    settings.TIMELINE_PAGE_SIZE = 2
+    settings.TIMELINE_BACKFILL_POSTS = 0
+    user_client.post(f"/profile/{another_user.username}/follow/")
+    assert Follow.objects.filter(user=user, author=another_user).exists()
+    hidden = mixer.blend(
+        "blog.Post", author=another_user, is_published=False,
+        category=author_posts[0].category,
+    )
+
+    call_command("fanout_timelines", stdout=StringIO())
+    assert TimelineEntry.objects.filter(user=user).count() == 5
+    assert not TimelineEntry.objects.filter(post=hidden).exists()
+
+    seen, queries = _read_all(user_client)
+    assert seen == [post.pk for post in author_posts], (
+        "Убедитесь, что лента подписок выводит посты от новых к старым"
+        " без пропусков и повторов."
+    )
+    assert len(queries) == 1, (
+        "Убедитесь, что каждая страница ленты подписок стоит одинаковое"
+        " число запросов."
+    )
+
+
+def test_celebrity_posts_read_on_display(
+    settings, user, user_client, another_user, author_posts
+):
+    settings.TIMELINE_CELEBRITY_FOLLOWERS = 1
+    settings.TIMELINE_PAGE_SIZE = 2
+    Follow.objects.create(user=user, author=another_user)
+    call_command("fanout_timelines", stdout=StringIO())
+    assert not TimelineEntry.objects.exists(), (
+        "Убедитесь, что посты знаменитостей не рассылаются по лентам."
+    )
+    seen, _ = _read_all(user_client)
+    assert seen == [post.pk for post in author_posts]
+
+
+def test_unfollow_clears_timeline(
+    user, user_client, another_user, author_posts
+):
+    user_client.post(f"/profile/{another_user.username}/follow/")
+    with CaptureQueriesContext(connection) as ctx:
+        profile = user_client.get(f"/profile/{another_user.username}/")
+    assert "Отписаться" in profile.content.decode()
+    assert sum(
+        '"blog_follow"' in query["sql"] for query in ctx.captured_queries
+    ) == 1, (
+        "Убедитесь, что подписка на автора проверяется одним запросом"
+        " на страницу профиля."
+    )
+    assert TimelineEntry.objects.filter(user=user).count() == 5, (
+        "Убедитесь, что при подписке последние посты автора попадают"
+        " в ленту."
+    )
+    user_client.post(f"/profile/{another_user.username}/unfollow/")
+    assert not Follow.objects.exists()
+    assert not TimelineEntry.objects.exists()
+    ids, _, _ = _timeline(user_client)
+    assert ids == []
+
+
+def test_invalid_cursor_is_404(user_client):
+    assert user_client.get("/timeline/?cursor=bad").status_code == 404
+    for items in ([{}, {}], [1, 2]):
+        cursor = base64.urlsafe_b64encode(json.dumps(items).encode()).decode()
+        response = user_client.get("/timeline/", {"cursor": cursor})
+        assert response.status_code == 404, (
+            "Убедитесь, что курсор с нестроковыми значениями даёт 404,"
+            " а не ошибку сервера."
+        )
@@ -0,0 +1,108 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import trending
+from blog.models import Comment, TrendingScore
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    return mixer.cycle(2).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+@pytest.fixture(autouse=True)
+def empty_buffer():
+    yield
+    # Таймер записи не должен сработать уже в другом тесте.
+    with trending.buffer.lock:
+        if trending.buffer.timer is not None:
+            trending.buffer.timer.cancel()
+            trending.buffer.timer = None
+        trending.buffer.deltas.clear()
+
+
+def _trending_ids(client):
+    response = client.get("/trending/")
+    assert response.status_code == 200
+    return [post.pk for post in response.context["object_list"]]
+
+
+def test_scores_follow_comment_events(
+    settings, client, mixer, user, posts,
+    django_capture_on_commit_callbacks,
+):
+    settings.TRENDING_FLUSH_INTERVAL = 0
+    first, second = posts
+    with django_capture_on_commit_callbacks(execute=True):
+        comments = mixer.cycle(3).blend(
+            "blog.Comment", post=first, author=user
+        )
+        mixer.cycle(2).blend("blog.Comment", post=second, author=user)
+    assert _trending_ids(client) == [first.pk, second.pk]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for comment in comments[:2]:
+            comment.delete()
+    assert TrendingScore.objects.get(post=first).score == pytest.approx(
+        TrendingScore.objects.get(post=second).score / 2
+    ), "Убедитесь, что удаление комментария уменьшает оценку поста."
+    assert _trending_ids(client)[0] == second.pk
+
+
+def test_buffered_scores_reach_cached_page(
+    client, mixer, user, posts, django_capture_on_commit_callbacks,
+):
+    first, _ = posts
+    with django_capture_on_commit_callbacks(execute=True):
+        mixer.blend("blog.Comment", post=first, author=user)
+    timer = trending.buffer.timer
+    assert timer is not None and timer.is_alive(), (
+        "Убедитесь, что изменения оценок записываются по таймеру, а не"
+        " только при следующем комментарии."
+    )
+    # Оценка ещё не записана: страница кешируется без поста.
+    stale = client.get("/trending/")
+    assert f"/posts/{first.pk}/" not in stale.content.decode()
+
+    timer.cancel()
+    trending.buffer.flush()
+    response = client.get("/trending/", HTTP_IF_NONE_MATCH=stale["ETag"])
+    assert response.status_code == 200, (
+        "Убедитесь, что запись оценок меняет ETag страницы /trending/."
+    )
+    assert f"/posts/{first.pk}/" in response.content.decode(), (
+        "Убедитесь, что запись оценок сбрасывает кеш страницы /trending/."
+    )
+
+
+def test_old_comments_decay(mixer, user, posts, client):
+    first, second = posts
+    mixer.cycle(3).blend("blog.Comment", post=first, author=user)
+    mixer.blend("blog.Comment", post=second, author=user)
+    Comment.objects.filter(post=first).update(
+        created_at=timezone.now() - timedelta(days=1)
+    )
+    call_command("update_trending", "--rebuild", stdout=StringIO())
+    assert _trending_ids(client) == [second.pk, first.pk], (
+        "Убедитесь, что давние комментарии весят меньше свежих."
+    )
+
+
+def test_rebase_to_new_epoch(settings, posts):
+    epoch = trending.current_epoch()
+    TrendingScore.objects.create(post=posts[0], score=16, epoch=epoch - 1)
+    trending.rebase(epoch)
+    row = TrendingScore.objects.get()
+    halvings = settings.TRENDING_EPOCH / settings.TRENDING_HALF_LIFE
+    expected = 16 * 2 ** -halvings
+    assert row.epoch == epoch
+    assert row.score == pytest.approx(expected)
@@ -0,0 +1,29 @@
+from django.template import engines
+from django.test import override_settings
+from django.urls import clear_url_caches, get_resolver
+
+from core import warmup
+
+
+@override_settings(WARMUP_ON_STARTUP=True)
+def test_warm_up_compiles_templates_and_resolver(monkeypatch):
+    calls = []
+    monkeypatch.setattr(warmup.gc, "freeze", lambda: None)
+    monkeypatch.setattr(
+        warmup, "check_connections", lambda: calls.append("connections")
+    )
+    loader = engines["django"].engine.template_loaders[0]
+    loader.reset()
+    clear_url_caches()
+
+    warmup.warm_up()
+
+    cached = set(loader.get_template_cache)
+    for name in ("base.html", "blog/index.html", "includes/header.html"):
+        assert name in cached, (
+            f"Убедитесь, что прогрев компилирует шаблон {name}."
+        )
+    assert get_resolver()._populated, (
+        "Убедитесь, что прогрев заполняет URL-резолвер."
+    )
+    assert calls == ["connections"]